@@ -3,6 +3,8 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 
+from core.paginators import EstimatedCountPaginator
+
 User = get_user_model()
 
 
@@ -12,6 +14,8 @@ class UserAdmin(BaseUserAdmin):
     list_display_links = ["id", "email"]
     list_editable = ["is_active"]
     list_per_page = 10
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     readonly_fields = ["last_login", "date_joined"]
     search_fields = ["email__istartswith"]
     ordering = ["email"]
@@ -0,0 +1,48 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from apps.accounts.cache import get_token_version, user_states
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    Authenticates bearer tokens from their claims and the cached user
+    state instead of loading the user row. request.user is a TokenUser.
+    Tokens issued before the user's last token version bump are revoked.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        state = user_states.get(user_id)
+        if state is None:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            )
+        if not state.is_active:
+            raise AuthenticationFailed(
+                _("User is inactive"), code="user_inactive"
+            )
+        if validated_token.get("is_staff", False) != state.is_staff:
+            raise AuthenticationFailed(
+                _("Token is no longer valid"), code="token_not_valid"
+            )
+        if validated_token.get("token_version", 0) != get_token_version(
+            user_id
+        ):
+            raise AuthenticationFailed(
+                _("Token has been revoked"), code="token_revoked"
+            )
+
+        return TokenUser(validated_token)
@@ -0,0 +1,19 @@
+from rest_framework_simplejwt.tokens import (
+    RefreshToken as BaseRefreshToken,
+)
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Carries the user state StatelessJWTAuthentication checks, and copies
+    it into every access token issued from it.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token["is_active"] = user.is_active
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        token["token_version"] = user.token_version
+        return token
@@ -1,14 +1,18 @@
-from threading import Thread
+from apps.accounts.tasks import send_templated_email
 
 
-class EmailThread(Thread):
+def send_email(
+    template_name, context, to, from_email="admin@example.com", token_user=None
+):
     """
-    Send email to client in a thread separate from Django thread.
+    Queue a templated email for the background job workers. The access
+    token of token_user is added to the context when the email is sent,
+    so that no live token is stored in the queue.
     """
-
-    def __init__(self, message):
-        Thread.__init__(self)
-        self.message = message
-
-    def run(self):
-        self.message.send()
+    send_templated_email.enqueue(
+        template_name=template_name,
+        context=context,
+        from_email=from_email,
+        to=to,
+        token_user_id=token_user.pk if token_user else None,
+    )
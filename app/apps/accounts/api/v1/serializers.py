@@ -12,6 +12,8 @@ from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError
 from rest_framework import status
 from rest_framework.response import Response
 
+from ..tokens import RefreshToken
+
 User = get_user_model()
 
 
@@ -72,6 +74,8 @@ class AccountVerifyResendSerializer(serializers.Serializer):
 
 
 class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    token_class = RefreshToken
+
     def validate(self, attrs):
         attrs = super().validate(attrs)
         attrs.update({"user_id": self.user.pk, "email": self.user.email})
@@ -163,5 +167,6 @@ class PasswordResetCompleteSerializer(serializers.Serializer):
             )
 
         attrs["user_id"] = decoded.get("user_id")
+        attrs["token_version"] = decoded.get("token_version", 0)
 
         return attrs
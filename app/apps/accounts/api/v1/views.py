@@ -4,7 +4,6 @@ from django.contrib.sites.shortcuts import get_current_site
 from django.shortcuts import get_object_or_404
 from jwt import decode
 from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError
-from mail_templated import EmailMessage
 from rest_framework import status
 from rest_framework.generics import (
     CreateAPIView,
@@ -14,7 +13,6 @@ from rest_framework.generics import (
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import (
     TokenObtainPairView as BaseTokenObtainPairView,
 )
@@ -27,7 +25,8 @@ from .serializers import (
     TokenObtainPairSerializer,
     UserSerializer,
 )
-from ..utilities import EmailThread
+from ..tokens import RefreshToken
+from ..utilities import send_email
 
 User = get_user_model()
 
@@ -46,25 +45,18 @@ class SignUpAPIView(CreateAPIView):
 
         # Send account verification email
         user = get_object_or_404(User, email=email)
-        token = self.get_tokens_for_user(user)
-        message = EmailMessage(
+        send_email(
             template_name="email/account_verification_email.tpl",
             context={
                 "subject": "Account Verification",
-                "token": token,
-                "domain": get_current_site(request),
+                "domain": get_current_site(request).domain,
             },
-            from_email="admin@example.com",
             to=[email],
+            token_user=user,
         )
-        EmailThread(message).start()
 
         return Response(data, status=status.HTTP_201_CREATED, headers=headers)
 
-    def get_tokens_for_user(self, user):
-        refresh = RefreshToken.for_user(user)
-        return str(refresh.access_token)
-
 
 class AccountVerifyAPIView(APIView):
     def get(self, request, token, *args, **kwargs):
@@ -97,26 +89,19 @@ class AccountVerifyResendAPIView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data.get("user")
-        token = self.get_tokens_for_user(user)
-        message = EmailMessage(
+        send_email(
             template_name="email/account_verification_email.tpl",
             context={
                 "subject": "Account Verification",
-                "token": token,
-                "domain": get_current_site(request),
+                "domain": get_current_site(request).domain,
             },
-            from_email="admin@example.com",
             to=[user.email],
+            token_user=user,
         )
-        EmailThread(message).start()
         return Response(
             {"detail": "Account verification email was sent to your email."}
         )
 
-    def get_tokens_for_user(self, user):
-        refresh = RefreshToken.for_user(user)
-        return str(refresh.access_token)
-
 
 class TokenObtainPairView(BaseTokenObtainPairView):
     serializer_class = TokenObtainPairSerializer
@@ -129,7 +114,8 @@ class PasswordChangeAPIView(UpdateAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user is a TokenUser for bearer tokens
+        return get_object_or_404(User, pk=self.request.user.pk)
 
     def update(self, request, *args, **kwargs):
         user = self.get_object()
@@ -147,6 +133,7 @@ class PasswordChangeAPIView(UpdateAPIView):
         new_password = serializer.validated_data.get("new_password1")
         user.set_password(new_password)
         user.save()
+        user.revoke_tokens()
         return Response(
             {"detail": "Password was successfully changed"},
             status=status.HTTP_200_OK,
@@ -161,26 +148,19 @@ class PasswordResetAPIView(GenericAPIView):
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data.get("user")
-        token = self.get_tokens_for_user(user)
-        message = EmailMessage(
+        send_email(
             template_name="email/password_reset_email.tpl",
             context={
                 "subject": "Password Reset",
-                "domain": get_current_site(request),
-                "token": token,
+                "domain": get_current_site(request).domain,
             },
-            from_email="admin@example.com",
             to=[user.email],
+            token_user=user,
         )
-        EmailThread(message).start()
         return Response(
             {"detail": "Password reset link was sent to your email."}
         )
 
-    def get_tokens_for_user(self, user):
-        refresh = RefreshToken.for_user(user)
-        return str(refresh.access_token)
-
 
 class PasswordResetConfirmAPIView(GenericAPIView):
     def get(self, request, token, *args, **kwargs):
@@ -208,9 +188,17 @@ class PasswordResetCompleteAPIView(GenericAPIView):
 
         password = serializer.validated_data.get("password1")
         user_id = serializer.validated_data.get("user_id")
+        token_version = serializer.validated_data.get("token_version")
         user = get_object_or_404(User, pk=user_id)
+        if token_version != user.token_version:
+            # The link was already used, or the password changed since
+            return Response(
+                {"detail": "Token is invalid."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
         user.set_password(password)
         user.save()
+        user.revoke_tokens()
         return Response(
             {"detail": "Your password has been successfully reset."}
         )
@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+TOKEN_VERSION_KEY = "accounts:token_version:{}"
+
+UserState = namedtuple("UserState", ["is_active", "is_staff"])
+
+
+class UserStateCache:
+    """
+    Bounded LRU of the user fields token authentication depends on.
+    Entries expire after ttl seconds so that changes made by other
+    processes are eventually seen.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(user_id)
+                return entry[1]
+
+        row = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list(*UserState._fields)
+            .first()
+        )
+        if row is None:
+            return None
+
+        state = UserState(*row)
+        with self.lock:
+            self.entries[user_id] = (now + self.ttl, state)
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        return state
+
+    def invalidate(self, user_id):
+        with self.lock:
+            self.entries.pop(user_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+user_states = UserStateCache(
+    maxsize=settings.ACCOUNTS_USER_STATE_CACHE_SIZE,
+    ttl=settings.ACCOUNTS_USER_STATE_CACHE_TTL,
+)
+
+
+def get_token_version(user_id):
+    """
+    Returns the token version tokens of the user must carry. A shared
+    cache makes revocations reach every process at once, a cache of each
+    process within ACCOUNTS_TOKEN_VERSION_TIMEOUT seconds.
+    """
+    key = TOKEN_VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = (
+            get_user_model()
+            .objects.filter(pk=user_id)
+            .values_list("token_version", flat=True)
+            .first()
+        )
+        if version is not None:
+            set_token_version(user_id, version)
+    return version
+
+
+def set_token_version(user_id, version):
+    cache.set(
+        TOKEN_VERSION_KEY.format(user_id),
+        version,
+        timeout=settings.ACCOUNTS_TOKEN_VERSION_TIMEOUT,
+    )
@@ -0,0 +1,70 @@
+import threading
+import traceback
+from functools import lru_cache
+
+from django.core.mail import get_connection
+from django.template.loader import get_template
+from mail_templated import EmailMessage
+
+_local = threading.local()
+
+
+@lru_cache(maxsize=None)
+def get_compiled_template(template_name):
+    """
+    Loads and compiles an email template once per process.
+    """
+    return get_template(template_name)
+
+
+def build_message(template_name, context, from_email, to):
+    message = EmailMessage(
+        template_name=template_name,
+        context=context,
+        from_email=from_email,
+        to=to,
+    )
+    message.template = get_compiled_template(template_name)
+    message.render()
+    return message
+
+
+def get_mail_connection():
+    """
+    Returns the mail connection of the current thread, which stays open
+    across batches.
+    """
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        connection = get_connection()
+        connection.open()
+        _local.connection = connection
+    return connection
+
+
+def close_mail_connection():
+    connection = getattr(_local, "connection", None)
+    _local.connection = None
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+def send_batch(messages):
+    """
+    Sends messages over the thread's persistent connection and returns
+    one error per message, None for the ones that were sent.
+    """
+    errors = []
+    for message in messages:
+        try:
+            get_mail_connection().send_messages([message])
+        except Exception:
+            # Reconnect for the rest in case the server dropped us
+            close_mail_connection()
+            errors.append(traceback.format_exc())
+        else:
+            errors.append(None)
+    return errors
@@ -0,0 +1,117 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authentication import (
+    BasicAuthentication,
+    SessionAuthentication,
+)
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.accounts.api.authentication import StatelessJWTAuthentication
+from apps.accounts.api.tokens import RefreshToken
+from core.benchmarks import Timings
+
+User = get_user_model()
+
+EMAIL = "benchmark{}@example.com"
+
+CHAINS = {
+    "previous chain": [
+        BasicAuthentication,
+        SessionAuthentication,
+        JWTAuthentication,
+    ],
+    "stateless JWT first": [
+        StatelessJWTAuthentication,
+        SessionAuthentication,
+        BasicAuthentication,
+    ],
+}
+
+
+class PingView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response({"user_id": request.user.pk})
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares bearer-token authentication of the previous "
+        "authenticator chain against the stateless JWT chain, with tokens "
+        "issued to a growing number of users."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+        parser.add_argument(
+            "--users",
+            default="1,100,1000",
+            help="Comma-separated numbers of users holding tokens.",
+        )
+
+    def handle(self, *args, **options):
+        scales = [int(users) for users in options["users"].split(",")]
+        users = self.get_users(max(scales))
+        tokens = [str(RefreshToken.for_user(u).access_token) for u in users]
+        factory = APIRequestFactory()
+
+        for scale in scales:
+            for name, chain in CHAINS.items():
+                view = PingView.as_view(authentication_classes=chain)
+                # Warm the per-user caches before measuring
+                for token in tokens[:scale]:
+                    view(self.get_request(factory, token))
+
+                reset_queries()
+                timings = Timings()
+                with CaptureQueriesContext(connection) as queries:
+                    for index in range(options["requests"]):
+                        request = self.get_request(
+                            factory, tokens[index % scale]
+                        )
+                        response = timings.time(view, request)
+                        if response.status_code != 200:
+                            raise CommandError(
+                                f"{name}: HTTP {response.status_code}"
+                            )
+
+                self.stdout.write(
+                    f"{scale} users, {name}: "
+                    f"{timings.rate():.0f} req/s, "
+                    f"{timings.describe(digits=3)}, "
+                    f"{len(queries) / len(timings):.2f} queries/req"
+                )
+
+    def get_request(self, factory, token):
+        # A fresh request each time, SessionAuthentication would reuse
+        # the user set on a shared one
+        return factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def get_users(self, count):
+        """
+        Returns count active benchmark users, creating the missing ones.
+        """
+        emails = [EMAIL.format(index) for index in range(count)]
+        existing = set(
+            User.objects.filter(email__in=emails).values_list(
+                "email", flat=True
+            )
+        )
+        password = make_password(None)
+        User.objects.bulk_create(
+            User(email=email, password=password, is_active=True)
+            for email in emails
+            if email not in existing
+        )
+        users = list(User.objects.filter(email__in=emails, is_active=True))
+        if len(users) != count:
+            raise CommandError("Some benchmark users are inactive.")
+        return users
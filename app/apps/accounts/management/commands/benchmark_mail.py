@@ -0,0 +1,131 @@
+import socketserver
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+from mail_templated import EmailMessage
+
+from apps.accounts.mail import (
+    build_message,
+    close_mail_connection,
+    send_batch,
+)
+from core.benchmarks import Timings
+
+TEMPLATE_NAME = "email/account_verification_email.tpl"
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """
+    Accepts any message, waiting latency seconds before every reply to
+    stand in for the network round trip to a real SMTP server.
+    """
+
+    def handle(self):
+        self.reply("220 stub ESMTP")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            command = line[:4].upper()
+            if command in [b"HELO", b"EHLO"]:
+                self.reply("250 stub")
+            elif command == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in [b".\r\n", b""]:
+                    pass
+                self.server.count()
+                self.reply("250 OK")
+            elif command == b"QUIT":
+                self.reply("221 Bye")
+                break
+            else:
+                self.reply("250 OK")
+
+    def reply(self, text):
+        time.sleep(self.server.latency)
+        self.wfile.write(f"{text}\r\n".encode())
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency):
+        super().__init__(("127.0.0.1", 0), StubSMTPHandler)
+        self.latency = latency
+        self.received = 0
+        self.lock = threading.Lock()
+
+    def count(self):
+        with self.lock:
+            self.received += 1
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares sending account emails one connection per message "
+        "against the batched dispatch over a stub SMTP server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--messages", type=int, default=200)
+        parser.add_argument("--batch-size", type=int, default=50)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=1.0,
+            help="Milliseconds the stub server waits before each reply.",
+        )
+
+    def handle(self, *args, **options):
+        server = StubSMTPServer(options["latency"] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        payloads = [
+            {
+                "template_name": TEMPLATE_NAME,
+                "context": {
+                    "subject": "Account Verification",
+                    "token": f"token-{index}",
+                    "domain": "example.com",
+                },
+                "from_email": "admin@example.com",
+                "to": [f"user{index}@example.com"],
+            }
+            for index in range(options["messages"])
+        ]
+
+        with override_settings(
+            EMAIL_BACKEND="django.core.mail.backends.smtp.EmailBackend",
+            EMAIL_HOST="127.0.0.1",
+            EMAIL_PORT=server.server_address[1],
+            EMAIL_USE_TLS=False,
+        ):
+            single = self.measure(self.send_single, payloads)
+            batched = self.measure(
+                self.send_batched, payloads, options["batch_size"]
+            )
+        server.shutdown()
+
+        self.stdout.write(f"One connection per message: {single:.1f} msg/s")
+        self.stdout.write(f"Batched dispatch: {batched:.1f} msg/s")
+        self.stdout.write(
+            self.style.SUCCESS(f"Speedup: {batched / single:.1f}x")
+        )
+
+    def measure(self, send, payloads, *args):
+        timings = Timings()
+        timings.time(send, payloads, *args)
+        return len(payloads) / timings.total
+
+    def send_single(self, payloads):
+        for payload in payloads:
+            EmailMessage(**payload).send()
+
+    def send_batched(self, payloads, batch_size):
+        for start in range(0, len(payloads), batch_size):
+            end = start + batch_size
+            send_batch([build_message(**p) for p in payloads[start:end]])
+        close_mail_connection()
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="token_version",
+            field=models.PositiveIntegerField(
+                default=0,
+                editable=False,
+                help_text="Embedded in issued tokens. Tokens carrying another version are rejected.",
+            ),
+        ),
+    ]
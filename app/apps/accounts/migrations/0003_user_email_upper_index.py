@@ -0,0 +1,33 @@
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def get_email_index():
+    # Serves email__istartswith, run as UPPER(email::text) LIKE 'PREFIX%'
+    return models.Index(
+        OpClass(Upper("email"), name="text_pattern_ops"),
+        name="user_email_upper_idx",
+    )
+
+
+def create_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        User = apps.get_model("accounts", "User")
+        schema_editor.add_index(User, get_email_index())
+
+
+def drop_email_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        User = apps.get_model("accounts", "User")
+        schema_editor.remove_index(User, get_email_index())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_user_token_version"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_index, drop_email_index),
+    ]
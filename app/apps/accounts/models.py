@@ -4,9 +4,12 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .cache import set_token_version
+
 
 class UserManager(BaseUserManager):
     """
@@ -78,6 +81,14 @@ class User(AbstractBaseUser, PermissionsMixin):
         ),
     )
     date_joined = models.DateTimeField(default=timezone.now)
+    token_version = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text=_(
+            "Embedded in issued tokens. Tokens carrying another version "
+            "are rejected."
+        ),
+    )
 
     objects = UserManager()
 
@@ -86,3 +97,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+    def revoke_tokens(self):
+        """
+        Invalidates every token issued to the user so far.
+        """
+        User.objects.filter(pk=self.pk).update(
+            token_version=F("token_version") + 1
+        )
+        self.refresh_from_db(fields=["token_version"])
+        set_token_version(self.pk, self.token_version)
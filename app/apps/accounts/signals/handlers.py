@@ -0,0 +1,13 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from ..cache import user_states
+
+User = get_user_model()
+
+
+@receiver(signal=post_save, sender=User)
+@receiver(signal=post_delete, sender=User)
+def invalidate_user_state(sender, instance, **kwargs):
+    user_states.invalidate(instance.pk)
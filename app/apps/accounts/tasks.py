@@ -0,0 +1,41 @@
+import traceback
+
+from django.contrib.auth import get_user_model
+
+from apps.jobs.queue import task
+
+from .api.tokens import RefreshToken
+from .mail import build_message, send_batch
+
+
+def get_access_token(user):
+    return str(RefreshToken.for_user(user).access_token)
+
+
+@task(batch=True)
+def send_templated_email(payloads):
+    """
+    Renders queued emails from the compiled templates and sends them
+    over one SMTP session. Emails with a token_user_id get the access
+    token of that user, minted at send time.
+    """
+    users = get_user_model().objects.in_bulk(
+        {payload.get("token_user_id") for payload in payloads} - {None}
+    )
+    messages, errors = [], []
+    for payload in payloads:
+        try:
+            payload = dict(payload)
+            user_id = payload.pop("token_user_id", None)
+            if user_id is not None:
+                payload["context"] = {
+                    **payload["context"],
+                    "token": get_access_token(users[user_id]),
+                }
+            messages.append(build_message(**payload))
+            errors.append(None)
+        except Exception:
+            errors.append(traceback.format_exc())
+
+    sent = iter(send_batch(messages))
+    return [error or next(sent) for error in errors]
@@ -1,10 +1,71 @@
+from django.conf import settings
 from django.contrib import admin
-from django.db.models import Count
+from django.contrib.admin.views.autocomplete import AutocompleteJsonView
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Case, When
 from django.urls import reverse
 from django.utils.html import format_html
 from django.utils.http import urlencode
-
-from . import models
+from django.utils.text import smart_split, unescape_string_literal
+
+from . import autocomplete, models
+from .counters import iter_pk_chunks, update_posts_in_chunks
+from .tasks import update_posts_status
+from core.paginators import EstimatedCountPaginator
+
+
+def is_autocomplete(request):
+    """
+    Whether the request comes from the picker of an autocomplete_fields
+    field, which searches on every keystroke.
+    """
+    return request.resolver_match.view_name == "admin:autocomplete"
+
+
+def get_search_terms(search_term):
+    """
+    Splits search_term into terms like the admin search does, quoted
+    phrases count as one term.
+    """
+    terms = []
+    for term in smart_split(search_term):
+        if term.startswith(('"', "'")) and term[0] == term[-1]:
+            term = unescape_string_literal(term)
+        terms.append(term)
+    return terms
+
+
+def search_autocomplete(request, queryset, term):
+    """
+    Looks term up in the autocomplete index, for the requested page of
+    the picker and one more row, so that the picker knows whether there
+    are more. The rows keep the order of the index.
+    """
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+    except ValueError:
+        page = 1
+    limit = page * AutocompleteJsonView.paginate_by + 1
+    pks = autocomplete.search(queryset.model, term, limit)
+    if not pks:
+        return queryset.none(), False
+    order = Case(*[When(pk=pk, then=index) for index, pk in enumerate(pks)])
+    return queryset.filter(pk__in=pks).order_by(order), False
+
+
+def get_autocomplete_term(request, search_term):
+    """
+    Returns the term to look up in the autocomplete index when the
+    request comes from a picker, None for other searches and for
+    several terms, which must all match.
+    """
+    if not is_autocomplete(request):
+        return None
+    terms = get_search_terms(search_term)
+    if len(terms) > 1:
+        return None
+    return terms[0] if terms else ""
 
 
 def pluralize_objects(objects_count):
@@ -15,30 +76,57 @@ def pluralize_objects(objects_count):
 
 @admin.register(models.Author)
 class AuthorAdmin(admin.ModelAdmin):
-    list_display = ["email", "first_name", "last_name"]
+    list_display = [
+        "email",
+        "first_name",
+        "last_name",
+        "posts_count",
+        "published_posts_count",
+    ]
     list_per_page = 10
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ["user__email__istartswith", "last_name__istartswith"]
     ordering = ["user__email"]
 
     def get_queryset(self, request):
         return super().get_queryset(request).select_related("user")
 
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Looks each term up in the email and last name indexes separately,
+        an OR across the join to users scans both tables.
+        """
+        term = get_autocomplete_term(request, search_term)
+        if term is not None:
+            return search_autocomplete(request, queryset, term)
+        for term in get_search_terms(search_term):
+            users = get_user_model().objects.filter(email__istartswith=term)
+            authors = models.Author.objects.filter(last_name__istartswith=term)
+            queryset = queryset.filter(
+                pk__in=users.values("pk").union(authors.values("pk"))
+            )
+        return queryset, False
+
     def email(self, author):
         return author.user.email
 
 
 @admin.register(models.Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ["pk", "title", "posts_count"]
+    list_display = ["pk", "title", "posts_count", "published_posts_count"]
     list_display_links = ["pk", "title"]
     list_per_page = 10
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     search_fields = ["title__istartswith"]
     ordering = ["title"]
 
-    def get_queryset(self, request):
-        return (
-            super().get_queryset(request).annotate(posts_count=Count("posts"))
-        )
+    def get_search_results(self, request, queryset, search_term):
+        term = get_autocomplete_term(request, search_term)
+        if term is not None:
+            return search_autocomplete(request, queryset, term)
+        return super().get_search_results(request, queryset, search_term)
 
     @admin.display(description="#posts", ordering="posts_count")
     def posts_count(self, category):
@@ -61,29 +149,67 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = ["status", "is_active"]
     list_filter = ["status", "is_active", "created_at"]
     list_per_page = 10
+    paginator = EstimatedCountPaginator
+    # Skips the COUNT(*) of the whole table shown next to filtered counts
+    show_full_result_count = False
     autocomplete_fields = ["category", "author"]
-    prepopulated_fields = {"slug": ["title"]}
-    readonly_fields = ["created_at", "updated_at"]
+    # Allocated from the title when the post is created
+    readonly_fields = ["slug", "created_at", "updated_at"]
+    # Served by a trigram index on PostgreSQL
     search_fields = ["title"]
     ordering = ["-created_at"]
     actions = ["set_as_draft", "set_as_published"]
 
     @admin.action(description="Set as draft")
     def set_as_draft(self, request, queryset):
-        updated_counts = queryset.update(status=models.Post.STATUS_DRAFT)
-        pluralized_posts = pluralize_objects(updated_counts)
-
-        self.message_user(
-            request,
-            message=f"{updated_counts} post{pluralized_posts} set as draft.",
-        )
+        self.set_status(request, queryset, models.Post.STATUS_DRAFT, "draft")
 
     @admin.action(description="Set as published")
     def set_as_published(self, request, queryset):
-        updated_counts = queryset.update(status=models.Post.STATUS_PUBLISHED)
-        pluralized_posts = pluralize_objects(updated_counts)
+        self.set_status(
+            request, queryset, models.Post.STATUS_PUBLISHED, "published"
+        )
 
+    def set_status(self, request, queryset, status, label):
+        """
+        Updates the selected posts a chunk at a time. Selections of more
+        than BLOG_ADMIN_ACTION_MAX_SYNC posts are queued as one job per
+        chunk, which the jobs admin lists.
+        """
+        chunk_size = settings.BLOG_ADMIN_ACTION_CHUNK_SIZE
+        if queryset.count() <= settings.BLOG_ADMIN_ACTION_MAX_SYNC:
+            updated_counts = sum(
+                update_posts_in_chunks(queryset, chunk_size, status=status)
+            )
+            pluralized_posts = pluralize_objects(updated_counts)
+            self.message_user(
+                request,
+                message=(
+                    f"{updated_counts} post{pluralized_posts} set as {label}."
+                ),
+            )
+            return
+
+        queued_counts = jobs_count = 0
+        with transaction.atomic():
+            for pks in iter_pk_chunks(queryset, chunk_size):
+                update_posts_status.enqueue(pks=pks, status=status)
+                queued_counts += len(pks)
+                jobs_count += 1
+        name = f"{update_posts_status.__module__}.update_posts_status"
+        url = (
+            reverse("admin:jobs_job_changelist")
+            + "?"
+            + urlencode({"name": name})
+        )
         self.message_user(
             request,
-            message=f"{updated_counts} post{pluralized_posts} set as published.",
+            message=format_html(
+                "{queued_counts} posts queued to be set as {label} in <a "
+                'href="{url}">{jobs_count} jobs</a>.',
+                queued_counts=queued_counts,
+                label=label,
+                url=url,
+                jobs_count=jobs_count,
+            ),
         )
@@ -0,0 +1,129 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.exceptions import APIException, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import exception_handler
+
+from .mixins import CachedResponseMixin, ConditionalResponseMixin
+from apps.blog.cache import aget_versions
+from core.db.routers import is_pinned_to_primary
+
+
+class AsyncReadView(View):
+    """
+    Async GET endpoint for the list or retrieve action of a blog viewset.
+
+    The viewset builds the queryset, renders the rows, caches the
+    response and computes its ETag and Last-Modified the same way as on
+    the sync endpoint; only the queries run through the async ORM. Only
+    public reads are served, so no authentication runs.
+    """
+
+    viewset_class = None
+    basename = None
+    action = None
+    renderer = JSONRenderer()
+
+    async def get(self, request, **kwargs):
+        view = self.get_viewset(request, kwargs)
+        try:
+            validators = await self.get_validators(view)
+            response = None
+            if validators is not None:
+                # 304 Not Modified before anything is serialized
+                response = view.check_validators(view.request, *validators)
+            if response is None:
+                response = self.render(await self.get_data(view, kwargs))
+        except APIException as exc:
+            response = exception_handler(
+                exc, {"view": view, "request": view.request}
+            )
+            return self.render(response.data, response.status_code)
+
+        if validators is not None and response.status_code in [200, 304]:
+            view.set_validators(response, *validators)
+        return response
+
+    def get_viewset(self, request, kwargs):
+        view = self.viewset_class(
+            basename=self.basename,
+            action=self.action,
+            action_map={"get": self.action},
+            args=(),
+            kwargs=kwargs,
+            format_kwarg=None,
+        )
+        view.request = view.initialize_request(request)
+        view.headers = {}
+        return view
+
+    async def get_validators(self, view):
+        """
+        Returns the validators of the sync endpoint's response, or None
+        when there is nothing to validate.
+        """
+        if not isinstance(view, ConditionalResponseMixin):
+            return None
+        if self.action == "list":
+
+            def get_validators():
+                queryset = view.filter_queryset(view.get_queryset())
+                return view.get_validators(queryset, allow_empty=True)
+
+        else:
+
+            def get_validators():
+                queryset = view.get_object_queryset()
+                return view.get_object_validators(queryset)
+
+        return await sync_to_async(view.get_cached_validators)(get_validators)
+
+    async def get_data(self, view, kwargs):
+        key = None
+        if isinstance(view, CachedResponseMixin):
+            versions = await aget_versions(*view.cache_models)
+            key = view.build_cache_key(view.request, versions)
+            if not is_pinned_to_primary():
+                data = await cache.aget(key)
+                if data is not None:
+                    return data
+
+        # Filter backends may validate their values against the database
+        queryset = await sync_to_async(view.filter_queryset)(
+            view.get_queryset()
+        )
+        if self.action == "list":
+            data = await self.list(view, queryset)
+        else:
+            data = await self.retrieve(view, queryset, kwargs)
+
+        if key is not None:
+            await cache.aset(key, data, timeout=view.cache_timeout)
+        return data
+
+    async def list(self, view, queryset):
+        paginator = view.paginator
+        if paginator is None:
+            items = [item async for item in queryset]
+            return view.get_serializer(items, many=True).data
+
+        page = await paginator.apaginate_queryset(queryset, view.request, view)
+        serializer = view.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data).data
+
+    async def retrieve(self, view, queryset, kwargs):
+        try:
+            obj = await queryset.aget(pk=kwargs["pk"])
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise NotFound()
+        return view.get_serializer(obj).data
+
+    def render(self, data, status=200):
+        return HttpResponse(
+            self.renderer.render(data),
+            status=status,
+            content_type=self.renderer.media_type,
+        )
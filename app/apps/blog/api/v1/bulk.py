@@ -0,0 +1,112 @@
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from .serializers import PostBulkItemSerializer
+from apps.blog import search
+from apps.blog.cache import bump_version
+from apps.blog.counters import get_state, get_states, update_counters
+from apps.blog.models import Category, Post
+from apps.blog.slugs import allocate_slugs
+
+
+class PostBulkWriter:
+    """
+    Validates a list of posts in one pass and writes the valid ones with
+    bulk_create and bulk_update in batches, inside one transaction.
+    Invalid items are reported by their index in the list.
+    """
+
+    item_serializer_class = PostBulkItemSerializer
+    update_fields = ["category", "title", "body", "status", "updated_at"]
+
+    def __init__(self, items, author_id, batch_size):
+        self.items = items
+        self.author_id = author_id
+        self.batch_size = batch_size
+        self.errors = {}
+        self.creates = []
+        self.updates = []
+
+    def validate(self):
+        valid = []
+        for index, item in enumerate(self.items):
+            serializer = self.item_serializer_class(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                self.errors[index] = serializer.errors
+
+        category_ids = {data["category"] for index, data in valid}
+        categories = Category.objects.in_bulk(category_ids)
+        pks = [data["pk"] for index, data in valid if "pk" in data]
+        # Only the author's own posts can be updated, like single updates
+        posts = Post.objects.filter(author_id=self.author_id).in_bulk(pks)
+
+        seen = set()
+        for index, data in valid:
+            category = categories.get(data["category"])
+            if category is None:
+                self.errors[index] = {
+                    "category": [_("Category does not exist.")]
+                }
+                continue
+            data["category"] = category
+
+            pk = data.pop("pk", None)
+            if pk is None:
+                self.creates.append(Post(author_id=self.author_id, **data))
+            elif pk not in posts or pk in seen:
+                self.errors[index] = {"pk": [_("Post not found.")]}
+            else:
+                seen.add(pk)
+                post = posts[pk]
+                for field, value in data.items():
+                    setattr(post, field, value)
+                self.updates.append(post)
+        return not self.errors
+
+    def save(self):
+        """
+        Writes the valid items. bulk_create and bulk_update send no
+        signals, so the post counters, the search index and response
+        caches are refreshed here.
+        """
+        if not (self.creates or self.updates):
+            return
+
+        slugs = allocate_slugs(post.title for post in self.creates)
+        for post, slug in zip(self.creates, slugs):
+            post.slug = slug
+        # bulk_update skips auto_now
+        now = timezone.now()
+        for post in self.updates:
+            post.updated_at = now
+
+        with transaction.atomic():
+            previous = get_states(
+                Post.objects.filter(pk__in=[post.pk for post in self.updates])
+            )
+            Post.objects.bulk_create(self.creates, batch_size=self.batch_size)
+            Post.objects.bulk_update(
+                self.updates, self.update_fields, batch_size=self.batch_size
+            )
+            update_counters(
+                previous,
+                {
+                    post.pk: get_state(post)
+                    for post in [*self.creates, *self.updates]
+                },
+            )
+            search.update_index(*self.creates, *self.updates)
+        bump_version(Post)
+
+    def get_result(self):
+        return {
+            "created": [post.pk for post in self.creates],
+            "updated": [post.pk for post in self.updates],
+            "errors": [
+                {"index": index, "errors": errors}
+                for index, errors in sorted(self.errors.items())
+            ],
+        }
@@ -0,0 +1,74 @@
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class StreamingExport:
+    """
+    Streams rows rendered by a serializer as NDJSON or as a JSON array,
+    encoding chunk_size rows at a time so memory stays flat whatever the
+    number of rows.
+    """
+
+    content_types = {
+        "ndjson": "application/x-ndjson",
+        "json": "application/json",
+    }
+
+    def __init__(self, rows, serializer, output, chunk_size):
+        self.rows = rows
+        self.serializer = serializer
+        self.output = output
+        self.chunk_size = chunk_size
+        self.encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def get_response(self, filename, asynchronous=False):
+        """
+        Returns the streaming response. Under ASGI it must be
+        asynchronous, Django reads a synchronous one into memory there.
+        """
+        response = StreamingHttpResponse(
+            self.astream() if asynchronous else self.stream(),
+            content_type=self.content_types[self.output],
+        )
+        response[
+            "Content-Disposition"
+        ] = f'attachment; filename="{filename}.{self.output}"'
+        return response
+
+    def stream(self):
+        if self.output == "ndjson":
+            for chunk in self.get_chunks():
+                yield "".join(self.encode(row) + "\n" for row in chunk)
+            return
+
+        yield "["
+        separator = ""
+        for chunk in self.get_chunks():
+            yield separator + ",".join(self.encode(row) for row in chunk)
+            separator = ","
+        yield "]\n"
+
+    async def astream(self):
+        # Every chunk is read on the same thread, where the database
+        # cursor of the rows lives
+        parts = self.stream()
+        next_part = sync_to_async(next, thread_sensitive=True)
+        while True:
+            part = await next_part(parts, None)
+            if part is None:
+                return
+            yield part
+
+    def encode(self, row):
+        return self.encoder.encode(self.serializer.to_representation(row))
+
+    def get_chunks(self):
+        chunk = []
+        for row in self.rows.iterator(chunk_size=self.chunk_size):
+            chunk.append(row)
+            if len(chunk) == self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
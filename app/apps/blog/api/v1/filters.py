@@ -1,5 +1,9 @@
+from django.db.models import Case, Q, When
+from django.utils.translation import gettext_lazy as _
 from django_filters import DateTimeFilter, FilterSet
+from rest_framework.filters import BaseFilterBackend
 
+from apps.blog import autocomplete, search
 from apps.blog.models import Post
 
 
@@ -10,3 +14,76 @@ class PostFilterSet(FilterSet):
     class Meta:
         model = Post
         fields = {"category": ["exact", "in"]}
+
+
+class PostSearchFilter(BaseFilterBackend):
+    """
+    Full-text search over post title and body through ?q=.
+    """
+
+    search_param = "q"
+    search_description = _("Full-text search over post title and body.")
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        return search.search(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.search_description),
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class PrefixFilter(BaseFilterBackend):
+    """
+    Case insensitive prefix lookup through ?prefix=, served by the
+    autocomplete index of the view's model. The view paginates with
+    CategoryPagination, only the matches up to the requested page are
+    looked up.
+    """
+
+    prefix_param = "prefix"
+    prefix_description = _("Case insensitive prefix of the title.")
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.prefix_param, "").strip()
+        if not prefix:
+            return queryset
+
+        model = queryset.model
+        if not autocomplete.is_indexed(model):
+            # The prefix indexes of the database page through the
+            # matches of tables too large for the index
+            matches = Q()
+            for field in autocomplete.FIELDS[model]:
+                matches |= Q(**{f"{field}__istartswith": prefix})
+            return queryset.filter(matches)
+
+        offset, page_size = view.paginator.get_prefix_window(request)
+        pks = autocomplete.search(model, prefix, offset + page_size + 1)
+        if not pks:
+            return queryset.none()
+        # The pages follow the order of the index
+        order = Case(
+            *[When(pk=pk, then=index) for index, pk in enumerate(pks)]
+        )
+        return queryset.filter(pk__in=pks).order_by(order)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.prefix_param,
+                "required": False,
+                "in": "query",
+                "description": str(self.prefix_description),
+                "schema": {"type": "string"},
+            },
+        ]
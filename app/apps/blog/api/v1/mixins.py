@@ -0,0 +1,364 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.functional import SimpleLazyObject
+from django.utils.http import http_date, quote_etag
+from rest_framework import serializers, status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from apps.blog.cache import get_versions
+from apps.blog.models import Author
+from core.db.routers import is_pinned_to_primary
+
+
+class CachedResponseMixin:
+    """
+    Caches list and retrieve responses until one of cache_models changes.
+    """
+
+    cache_models = []
+    cache_timeout = settings.BLOG_RESPONSE_CACHE_TIMEOUT
+
+    def list(self, request, *args, **kwargs):
+        return self.get_cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
+    def get_cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        # Clients pinned to the primary after a write replace whatever a
+        # lagging replica left under the new versions
+        if not is_pinned_to_primary():
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(key, response.data, timeout=self.cache_timeout)
+        return response
+
+    def get_cache_key(self, request):
+        return self.build_cache_key(request, get_versions(*self.cache_models))
+
+    def build_cache_key(self, request, versions):
+        """
+        Builds the key from the path, the normalized query string, the
+        URL kwargs and the current version of every model the response
+        depends on. Pagination links embed the host and the path.
+        """
+        params = sorted(
+            (name, sorted(values))
+            for name, values in request.query_params.lists()
+        )
+        parts = [
+            request.get_host(),
+            request.path,
+            self.basename,
+            self.action,
+            sorted(self.kwargs.items()),
+            params,
+            versions,
+        ]
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return f"blog:response:{digest}"
+
+
+class ConditionalResponseMixin:
+    """
+    Adds ETag and Last-Modified to list and retrieve responses and
+    answers If-None-Match and If-Modified-Since with 304 before anything
+    is serialized. Updates honour If-Match and If-Unmodified-Since.
+
+    List validators come from the count and the latest
+    last_modified_field of the filtered rows, one aggregate query, and
+    from the versions of etag_models, whose changes the rows miss. The
+    validators of one object come from its own row: last_modified_field
+    and etag_fields, the columns of the related rows it renders.
+    """
+
+    last_modified_field = None
+    etag_models = []
+    etag_fields = []
+
+    def list(self, request, *args, **kwargs):
+        validators = self.get_cached_validators(
+            lambda: self.get_validators(
+                self.filter_queryset(self.get_queryset()), allow_empty=True
+            )
+        )
+        return self.get_conditional_response(
+            validators, super().list, request, *args, **kwargs
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_cached_validators(
+            lambda: self.get_object_validators(self.get_object_queryset())
+        )
+        return self.get_conditional_response(
+            validators, super().retrieve, request, *args, **kwargs
+        )
+
+    def update(self, request, *args, **kwargs):
+        if not {"HTTP_IF_MATCH", "HTTP_IF_UNMODIFIED_SINCE"} & set(
+            request.META
+        ):
+            return super().update(request, *args, **kwargs)
+
+        with transaction.atomic():
+            queryset = self.get_object_queryset()
+            # Held until the update commits, so no write slips in between
+            list(queryset.select_for_update().values_list("pk"))
+            validators = self.get_object_validators(queryset)
+            if validators is not None:
+                response = self.check_validators(request, *validators)
+                if response is not None:
+                    # 412 Precondition Failed
+                    return response
+            response = super().update(request, *args, **kwargs)
+
+        validators = self.get_object_validators(self.get_object_queryset())
+        if validators is not None:
+            self.set_validators(response, *validators)
+        return response
+
+    def get_object_queryset(self):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.get_queryset()
+        try:
+            return queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            )
+        except (TypeError, ValueError, ValidationError):
+            # Invalid lookups are answered with 404 like by get_object()
+            return queryset.none()
+
+    def get_conditional_response(
+        self, validators, handler, request, *args, **kwargs
+    ):
+        if validators is None:
+            # Nothing to validate, e.g. an unknown post answered with 404
+            return handler(request, *args, **kwargs)
+
+        response = self.check_validators(request, *validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in [
+            status.HTTP_200_OK,
+            status.HTTP_304_NOT_MODIFIED,
+        ]:
+            self.set_validators(response, *validators)
+        return response
+
+    def check_validators(self, request, etag, last_modified):
+        """
+        Returns the 304 or 412 response the request headers call for, or
+        None.
+        """
+        return get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=last_modified and int(last_modified.timestamp()),
+        )
+
+    def set_validators(self, response, etag, last_modified):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+
+    def get_cached_validators(self, get_validators):
+        """
+        Shares the validators through the response cache, whose keys
+        change with every write to the cached models.
+        """
+        if not isinstance(self, CachedResponseMixin):
+            return get_validators()
+
+        key = self.get_cache_key(self.request) + ":validators"
+        # A tuple, since None means there is nothing to validate
+        cached = None if is_pinned_to_primary() else cache.get(key)
+        if cached is None:
+            cached = (get_validators(),)
+            cache.set(key, cached, timeout=self.cache_timeout)
+        return cached[0]
+
+    def get_validators(self, queryset, allow_empty=False):
+        """
+        Returns the ETag and the last modification time of the rows of
+        queryset, or None when it has no rows and allow_empty is False.
+        """
+        aggregates = {"count": Count("pk")}
+        if self.last_modified_field is not None:
+            aggregates["last_modified"] = Max(self.last_modified_field)
+        values = queryset.order_by().aggregate(**aggregates)
+        if not values["count"] and not allow_empty:
+            return None
+
+        last_modified = values.get("last_modified")
+        params = sorted(
+            (name, sorted(items))
+            for name, items in self.request.query_params.lists()
+        )
+        parts = [
+            self.request.path,
+            params,
+            values["count"],
+            last_modified and last_modified.isoformat(),
+            get_versions(*self.etag_models),
+        ]
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        return quote_etag(digest), last_modified
+
+    def get_object_validators(self, queryset):
+        """
+        Returns the ETag and the last modification time of the object of
+        queryset, or None when there is no such object. Writes elsewhere
+        leave them alone, so If-Match only fails when the object or a
+        related row it renders changed.
+        """
+        fields = ["pk", *self.etag_fields]
+        if self.last_modified_field is not None:
+            fields.append(self.last_modified_field)
+        row = queryset.order_by().values_list(*fields).first()
+        if row is None:
+            return None
+
+        last_modified = None
+        if self.last_modified_field is not None:
+            last_modified = row[-1]
+        digest = hashlib.md5(repr([self.request.path, row]).encode())
+        return quote_etag(digest.hexdigest()), last_modified
+
+
+class CompiledReadMixin:
+    """
+    Serves list and retrieve from QuerySet.values() rows rendered by
+    read_serializer_class, a CompiledReadSerializer. Schema generation
+    keeps describing the regular serializer.
+    """
+
+    read_serializer_class = None
+    read_actions = ["list", "retrieve"]
+
+    def uses_read_serializer(self):
+        return self.action in self.read_actions and not getattr(
+            self, "swagger_fake_view", False
+        )
+
+    def get_serializer_class(self):
+        if self.uses_read_serializer():
+            return self.read_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.uses_read_serializer():
+            queryset = self.read_serializer_class.project(
+                queryset, self.action
+            )
+        return queryset
+
+
+class ProjectionMixin:
+    """
+    Loads only the columns the action's serializer reads, through
+    QuerySet.only(), instead of every column of every joined table.
+    projection_fields adds columns read elsewhere, e.g. by permissions
+    or Model.save().
+    """
+
+    projection_fields = []
+    projections = {}
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, "swagger_fake_view", False):
+            return queryset
+
+        serializer_class = self.get_projection_serializer_class()
+        if serializer_class is not None and not issubclass(
+            serializer_class, serializers.Serializer
+        ):
+            # Compiled serializers project their querysets themselves
+            return queryset
+
+        key = (type(self), getattr(self, "action", None), serializer_class)
+        if key not in self.projections:
+            self.projections[key] = [
+                *self.get_projection(serializer_class),
+                *self.projection_fields,
+            ]
+
+        fields = self.projections[key]
+        related = {
+            field.rpartition("__")[0] for field in fields if "__" in field
+        }
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*fields)
+
+    def get_projection_serializer_class(self):
+        """
+        Returns the serializer rendering the objects, None if nothing is
+        rendered.
+        """
+        if getattr(self, "action", None) == "destroy":
+            return None
+        return self.get_serializer_class()
+
+    def get_projection(self, serializer_class):
+        if serializer_class is None:
+            return []
+        serializer = serializer_class(context=self.get_serializer_context())
+        return self.get_field_lookups(serializer.fields.values())
+
+    def get_field_lookups(self, fields, prefix=""):
+        """
+        Returns the lookups behind the sources of the serializer fields.
+        """
+        lookups = []
+        for field in fields:
+            if field.write_only or field.source == "*":
+                continue
+            if field.source_attrs[-1] == "pk":
+                # Primary keys are always loaded
+                continue
+            lookup = prefix + "__".join(field.source_attrs)
+            if isinstance(field, serializers.BaseSerializer):
+                lookups.extend(
+                    self.get_field_lookups(
+                        field.fields.values(), lookup + "__"
+                    )
+                )
+            else:
+                lookups.append(lookup)
+        return lookups
+
+
+class RequestAuthorMixin:
+    """
+    Attaches the requesting user's author to write requests once, after
+    authentication. Authors share their user's primary key, so
+    request.author_id costs nothing and request.author is only loaded
+    when used.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS or not request.user.is_authenticated:
+            return
+
+        author_id = request.user.pk
+        request.author_id = author_id
+        request.author = SimpleLazyObject(
+            lambda: Author.objects.get(pk=author_id)
+        )
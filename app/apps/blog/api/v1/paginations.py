@@ -1,13 +1,229 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.paginator import InvalidPage
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import (
+    BasePagination,
+    PageNumberPagination,
+    _positive_int,
+)
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates by seeking on (created_at, pk) instead of using offsets,
+    so deep pages cost the same as the first one and no count is run.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    ordering_field = "created_at"
+    invalid_cursor_message = _("Invalid cursor.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.set_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request, view):
+        """
+        Returns the page plus one item, telling whether more follow.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.descending = self.get_descending(request, queryset, view)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        # Seek backwards through the ordering for the previous page
+        queryset = self.seek(
+            queryset, self.position, self.descending != self.reverse
+        )
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = self.position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "links": {
+                    "next": self.get_next_link(),
+                    "previous": self.get_previous_link(),
+                },
+                "results": data,
+            }
+        )
+
+    def seek(self, queryset, position, descending):
+        """
+        Orders by (created_at, pk) and keeps the rows after position.
+        The outer range on created_at lets the database seek the index.
+        """
+        field = self.ordering_field
+        if descending:
+            queryset = queryset.order_by(f"-{field}", "-pk")
+            lookup, bound = "lt", "lte"
+        else:
+            queryset = queryset.order_by(field, "pk")
+            lookup, bound = "gt", "gte"
+
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(**{f"{field}__{bound}": created_at}),
+                Q(**{f"{field}__{lookup}": created_at})
+                | Q(**{f"pk__{lookup}": pk}),
+            )
+        return queryset
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def get_descending(self, request, queryset, view):
+        """
+        Follows the direction requested through OrderingFilter, if any.
+        """
+        for backend in getattr(view, "filter_backends", []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                for term in ordering or []:
+                    if term.lstrip("-") == self.ordering_field:
+                        return term.startswith("-")
+        return True
+
+    def get_position(self, item):
+        if isinstance(item, dict):
+            # Rows of a values() queryset
+            return item[self.ordering_field], item["pk"]
+        return getattr(item, self.ordering_field), item.pk
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[-1]), False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.get_position(self.page[0]), True)
+
+    def encode_cursor(self, position, reverse):
+        created_at, pk = position
+        token = json.dumps([created_at.isoformat(), pk, reverse])
+        encoded = base64.urlsafe_b64encode(token.encode()).decode()
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            token = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, pk, reverse = json.loads(token)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if created_at is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (created_at, pk), bool(reverse)
 
 
 class DefaultPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Switches to keyset pagination with ?pagination=cursor,
+        or when a cursor from a previous keyset page is given.
+        """
+        self.keyset = None
+        if self.is_keyset_request(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of paginate_queryset for the async ORM.
+        """
+        self.keyset = None
+        if self.is_keyset_request(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+            return await self.keyset.apaginate_queryset(
+                queryset, request, view
+            )
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        # Paginator.count is a sync cached_property, fill it in beforehand
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            msg = self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            )
+            raise NotFound(msg)
+        self.page.object_list = [item async for item in self.page.object_list]
+        self.request = request
+        return list(self.page)
+
+    def is_keyset_request(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
 
     def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+
         return Response(
             {
                 "links": {
@@ -19,3 +235,91 @@ class DefaultPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class CategoryPagination(DefaultPagination):
+    """
+    Pages categories by number. Pages of ?prefix= lookups are not
+    counted: PrefixFilter only fetches the matches up to the end of the
+    requested page and one more, which tells whether another follows.
+    """
+
+    page_size = 50
+    max_page_size = 100
+    prefix_query_param = "prefix"
+    invalid_number_message = _("Not a positive integer.")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.number = None
+        if not self.is_prefix_request(request):
+            return super().paginate_queryset(queryset, request, view)
+        return self.set_prefix_page(list(self.get_window(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        self.number = None
+        if not self.is_prefix_request(request):
+            return await super().apaginate_queryset(queryset, request, view)
+        window = self.get_window(queryset, request)
+        return self.set_prefix_page([item async for item in window])
+
+    def is_keyset_request(self, request):
+        # Categories have no created_at to seek on
+        return False
+
+    def is_prefix_request(self, request):
+        prefix = request.query_params.get(self.prefix_query_param, "")
+        return bool(prefix.strip())
+
+    def get_prefix_window(self, request):
+        """
+        Returns the offset and size of the requested page of matches.
+        """
+        page_size = self.get_page_size(request)
+        number = request.query_params.get(self.page_query_param, 1)
+        try:
+            number = _positive_int(number, strict=True)
+        except ValueError:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=number, message=self.invalid_number_message
+                )
+            )
+        return (number - 1) * page_size, page_size
+
+    def get_window(self, queryset, request):
+        """
+        Returns the requested page of matches and one more row.
+        """
+        self.request = request
+        offset, self.prefix_page_size = self.get_prefix_window(request)
+        self.number = offset // self.prefix_page_size + 1
+        end = offset + self.prefix_page_size + 1
+        return queryset[offset:end]
+
+    def set_prefix_page(self, results):
+        self.has_next = len(results) > self.prefix_page_size
+        return results[: self.prefix_page_size]
+
+    def get_paginated_response(self, data):
+        if self.number is None:
+            return super().get_paginated_response(data)
+
+        return Response(
+            {
+                "links": {
+                    "next": self.get_prefix_link(self.number + 1)
+                    if self.has_next
+                    else None,
+                    "previous": self.get_prefix_link(self.number - 1)
+                    if self.number > 1
+                    else None,
+                },
+                "results": data,
+            }
+        )
+
+    def get_prefix_link(self, number):
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
@@ -12,4 +12,4 @@ class IsPostAuthorOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return bool(request.user and obj.author.user == request.user)
+        return bool(request.user and obj.author_id == request.user.pk)
@@ -8,4 +8,10 @@ class AuthorSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Author
-        fields = ["email", "first_name", "last_name"]
+        fields = [
+            "email",
+            "first_name",
+            "last_name",
+            "posts_count",
+            "published_posts_count",
+        ]
@@ -0,0 +1,80 @@
+from rest_framework import serializers
+
+
+class CompiledReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer for rows fetched with QuerySet.values().
+
+    plans maps a view action to its output, as (key, lookup) pairs where
+    a list of pairs in place of the lookup renders a nested object.
+    Plans are compiled once per class into the lookups to fetch and the
+    converters to run, so rows become dicts without any field machinery.
+    """
+
+    plans = {}
+    # Lookups fetched for every plan but not rendered, e.g. for pagination
+    fetch = []
+    # Annotations rendered under their key only when the queryset has them
+    optional = {}
+    converters = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.compiled = {
+            action: cls.compile(plan) for action, plan in cls.plans.items()
+        }
+
+    @classmethod
+    def compile(cls, plan):
+        compiled = []
+        for key, lookup in plan:
+            if isinstance(lookup, list):
+                compiled.append((key, None, cls.compile(lookup)))
+            else:
+                compiled.append((key, lookup, cls.converters.get(lookup)))
+        return compiled
+
+    @classmethod
+    def get_lookups(cls, plan):
+        lookups = []
+        for key, lookup, extra in plan:
+            if lookup is None:
+                lookups.extend(cls.get_lookups(extra))
+            else:
+                lookups.append(lookup)
+        return lookups
+
+    @classmethod
+    def project(cls, queryset, action):
+        """
+        Returns queryset.values() with the lookups the action renders.
+        """
+        query = queryset.query
+        selected = {*query.extra_select, *query.annotation_select}
+        lookups = [
+            *cls.get_lookups(cls.compiled[action]),
+            *cls.fetch,
+            *[lookup for lookup in cls.optional if lookup in selected],
+        ]
+        return queryset.values(*dict.fromkeys(lookups))
+
+    def to_representation(self, row):
+        view = self.context.get("view")
+        rep = self.render(row, self.compiled[view.action])
+        for lookup, key in self.optional.items():
+            value = row.get(lookup)
+            if value is not None:
+                rep[key] = value
+        return rep
+
+    def render(self, row, plan):
+        rep = {}
+        for key, lookup, convert in plan:
+            if lookup is None:
+                rep[key] = self.render(row, convert)
+                continue
+            value = row[lookup]
+            if convert is not None and value is not None:
+                value = convert(value)
+            rep[key] = value
+        return rep
@@ -1,12 +1,18 @@
 from rest_framework import serializers
 
+from .compiled import CompiledReadSerializer
 from apps.blog.models import Author, Category, Post
 
 
 class CategorySerializer(serializers.ModelSerializer):
+    # Only published posts are public
+    posts_count = serializers.IntegerField(
+        source="published_posts_count", read_only=True
+    )
+
     class Meta:
         model = Category
-        fields = ["pk", "title", "description"]
+        fields = ["pk", "title", "description", "posts_count"]
 
     def to_representation(self, instance):
         """
@@ -21,6 +27,11 @@ class CategorySerializer(serializers.ModelSerializer):
         return rep
 
 
+class PostCategorySerializer(CategorySerializer):
+    class Meta(CategorySerializer.Meta):
+        fields = ["pk", "title", "description"]
+
+
 class PostAuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Author
@@ -28,7 +39,7 @@ class PostAuthorSerializer(serializers.ModelSerializer):
 
 
 class PostSerializer(serializers.ModelSerializer):
-    category = CategorySerializer()
+    category = PostCategorySerializer()
     author = PostAuthorSerializer()
 
     class Meta:
@@ -56,16 +67,111 @@ class PostSerializer(serializers.ModelSerializer):
             rep.pop("body", None)
             rep.pop("created_at", None)
             rep.pop("updated_at", None)
+
+        highlight = getattr(instance, "search_highlight", None)
+        if highlight is not None:
+            # Snippet of the body matching a full-text search
+            rep["highlight"] = highlight
         return rep
 
 
+class CategoryReadSerializer(CompiledReadSerializer):
+    """
+    Same output as CategorySerializer, rendered from values() rows.
+    """
+
+    plans = {
+        "list": [
+            ("pk", "pk"),
+            ("title", "title"),
+            ("posts_count", "published_posts_count"),
+        ],
+        "retrieve": [
+            ("pk", "pk"),
+            ("title", "title"),
+            ("description", "description"),
+            ("posts_count", "published_posts_count"),
+        ],
+    }
+
+
+class PostReadSerializer(CompiledReadSerializer):
+    """
+    Same output as PostSerializer, rendered from values() rows.
+    """
+
+    plans = {
+        "list": [
+            ("pk", "pk"),
+            ("title", "title"),
+            ("status", "status"),
+            (
+                "category",
+                [("pk", "category_id"), ("title", "category__title")],
+            ),
+            (
+                "author",
+                [
+                    ("first_name", "author__first_name"),
+                    ("last_name", "author__last_name"),
+                ],
+            ),
+        ],
+        "retrieve": [
+            ("pk", "pk"),
+            ("title", "title"),
+            ("body", "body"),
+            ("status", "status"),
+            (
+                "category",
+                [
+                    ("pk", "category_id"),
+                    ("title", "category__title"),
+                    ("description", "category__description"),
+                ],
+            ),
+            (
+                "author",
+                [
+                    ("first_name", "author__first_name"),
+                    ("last_name", "author__last_name"),
+                ],
+            ),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ],
+    }
+    plans["export"] = plans["retrieve"]
+    # Keyset pagination reads the position of the first and last rows
+    fetch = ["created_at"]
+    optional = {"search_highlight": "highlight"}
+    converters = {
+        "created_at": serializers.DateTimeField().to_representation,
+        "updated_at": serializers.DateTimeField().to_representation,
+    }
+
+
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Post
         fields = ["category", "title", "body", "status"]
 
     def create(self, validated_data):
-        author = self.context.get("author")
-        post = Post.objects.create(author=author, **validated_data)
+        author_id = self.context.get("author_id")
+        post = Post.objects.create(author_id=author_id, **validated_data)
         self.instance = post
         return post
+
+
+class PostBulkItemSerializer(serializers.ModelSerializer):
+    """
+    One post of a bulk write. Items with a pk update that post, the
+    others create one. Categories are checked for the whole batch at once.
+    """
+
+    pk = serializers.IntegerField(required=False)
+    category = serializers.IntegerField()
+
+    class Meta:
+        model = Post
+        fields = ["pk", "category", "title", "body", "status"]
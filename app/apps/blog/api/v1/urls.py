@@ -1,7 +1,8 @@
-from django.urls import include, path
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from . import views
+from .async_views import AsyncReadView
 
 app_name = "blog_api_1.0"
 
@@ -9,7 +10,46 @@ router = DefaultRouter()
 router.register("categories", views.CategoryViewSet, basename="category")
 router.register("posts", views.PostViewSet, basename="post")
 
+# Async read endpoints, mirroring the router's URLs and lookup
+async_urlpatterns = [
+    path(
+        "categories/",
+        AsyncReadView.as_view(
+            viewset_class=views.CategoryViewSet,
+            basename="category",
+            action="list",
+        ),
+        name="category-list",
+    ),
+    re_path(
+        r"^categories/(?P<pk>[^/.]+)/$",
+        AsyncReadView.as_view(
+            viewset_class=views.CategoryViewSet,
+            basename="category",
+            action="retrieve",
+        ),
+        name="category-detail",
+    ),
+    path(
+        "posts/",
+        AsyncReadView.as_view(
+            viewset_class=views.PostViewSet, basename="post", action="list"
+        ),
+        name="post-list",
+    ),
+    re_path(
+        r"^posts/(?P<pk>[^/.]+)/$",
+        AsyncReadView.as_view(
+            viewset_class=views.PostViewSet,
+            basename="post",
+            action="retrieve",
+        ),
+        name="post-detail",
+    ),
+]
+
 urlpatterns = [
     path("", include(router.urls)),
     path("me/", views.AuthorDetailAPIView.as_view(), name="author-detail"),
+    path("async/", include((async_urlpatterns, "async"))),
 ]
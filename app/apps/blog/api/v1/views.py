@@ -1,45 +1,98 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.shortcuts import get_object_or_404
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.generics import RetrieveUpdateAPIView
+from rest_framework.response import Response
 from rest_framework.permissions import (
     IsAuthenticated,
     IsAuthenticatedOrReadOnly,
 )
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 
+from .bulk import PostBulkWriter
+from .exports import StreamingExport
 from .permissions import IsPostAuthorOrReadOnly
-from .filters import PostFilterSet
-from .paginations import DefaultPagination
+from .filters import PostFilterSet, PostSearchFilter, PrefixFilter
+from .mixins import (
+    CachedResponseMixin,
+    CompiledReadMixin,
+    ConditionalResponseMixin,
+    ProjectionMixin,
+    RequestAuthorMixin,
+)
+from .paginations import CategoryPagination, DefaultPagination
 from .serializers import (
     AuthorSerializer,
+    CategoryReadSerializer,
     CategorySerializer,
+    PostReadSerializer,
     PostSerializer,
     PostCreateUpdateSerializer,
 )
 from apps.blog.models import Author, Category, Post
 
 
-class AuthorDetailAPIView(RetrieveUpdateAPIView):
+class AuthorDetailAPIView(ProjectionMixin, RetrieveUpdateAPIView):
     serializer_class = AuthorSerializer
     queryset = Author.objects.select_related("user")
     permission_classes = [IsAuthenticated]
 
     def get_object(self):
         author = get_object_or_404(
-            self.get_queryset(), user_id=self.request.user.pk
+            self.filter_queryset(self.get_queryset()),
+            user_id=self.request.user.pk,
         )
         return author
 
 
-class CategoryViewSet(ReadOnlyModelViewSet):
+class CategoryViewSet(
+    ConditionalResponseMixin,
+    CompiledReadMixin,
+    CachedResponseMixin,
+    ReadOnlyModelViewSet,
+):
+    # Post writes change the posts counts
+    cache_models = [Category, Post]
+    etag_models = [Category, Post]
+    etag_fields = ["title", "description", "published_posts_count"]
     serializer_class = CategorySerializer
+    read_serializer_class = CategoryReadSerializer
     queryset = Category.objects.all().order_by("title")
+    filter_backends = [PrefixFilter]
+    pagination_class = CategoryPagination
 
 
-class PostViewSet(ModelViewSet):
-    filter_backends = [SearchFilter, DjangoFilterBackend, OrderingFilter]
-    search_fields = ["title"]
+class PostViewSet(
+    RequestAuthorMixin,
+    ConditionalResponseMixin,
+    ProjectionMixin,
+    CompiledReadMixin,
+    CachedResponseMixin,
+    ModelViewSet,
+):
+    cache_models = [Post, Category, Author]
+    # Posts render their category and author
+    last_modified_field = "updated_at"
+    etag_models = [Category, Author]
+    etag_fields = [
+        "category__title",
+        "category__description",
+        "author__first_name",
+        "author__last_name",
+    ]
+    # Read by IsPostAuthorOrReadOnly, the search index and Post.save(),
+    # which also passes the category to the post counters
+    projection_fields = ["author", "category", "is_active", "updated_at"]
+    serializer_class = PostSerializer
+    read_serializer_class = PostReadSerializer
+    read_actions = ["list", "retrieve", "export"]
+    filter_backends = [PostSearchFilter, DjangoFilterBackend, OrderingFilter]
     filterset_class = PostFilterSet
     ordering_fields = ["created_at"]
     pagination_class = DefaultPagination
@@ -48,24 +101,76 @@ class PostViewSet(ModelViewSet):
     def get_serializer_class(self):
         if self.request.method in ["POST", "PUT", "PATCH"]:
             return PostCreateUpdateSerializer
-        return PostSerializer
+        return super().get_serializer_class()
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
-
-        try:
-            author = Author.objects.get(user_id=self.request.user.pk)
-            context["author"] = author
-        except Author.DoesNotExist:
-            pass
-
+        author_id = getattr(self.request, "author_id", None)
+        if author_id is not None:
+            context["author_id"] = author_id
         return context
 
     def get_queryset(self):
         if self.request.method in ["GET", "HEAD", "OPTIONS"]:
-            return Post.published.select_related(
-                "category", "author__user"
-            ).order_by("-created_at")
-        return Post.objects.select_related(
-            "category", "author__user"
-        ).order_by("-created_at")
+            # Rendered from values() rows, which join what they select
+            return Post.published.order_by("-created_at")
+        # Writes check ownership on author_id and never render relations
+        return Post.objects.order_by("-created_at")
+
+    @action(detail=False, pagination_class=None)
+    def export(self, request):
+        """
+        Streams every published post matching the list filters, in
+        primary key order, as NDJSON (?output=ndjson, the default) or as
+        a JSON array (?output=json). ?after=<pk> resumes an export after
+        the last post received.
+        """
+        output = request.query_params.get("output", "ndjson")
+        if output not in StreamingExport.content_types:
+            raise ValidationError({"output": _("Use ndjson or json.")})
+
+        queryset = self.filter_queryset(self.get_queryset())
+        after = request.query_params.get("after")
+        if after:
+            try:
+                queryset = queryset.filter(pk__gt=int(after))
+            except ValueError:
+                raise ValidationError({"after": _("A post id is required.")})
+
+        export = StreamingExport(
+            # The primary key order makes ?after= resume where it stopped
+            queryset.order_by("pk"),
+            self.get_serializer(),
+            output,
+            settings.BLOG_EXPORT_CHUNK_SIZE,
+        )
+        return export.get_response(
+            "posts", asynchronous=isinstance(request._request, ASGIRequest)
+        )
+
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Creates and updates up to BLOG_BULK_MAX_ITEMS posts given as a
+        list. Items with a pk update that post of the author, the others
+        are created. Valid items are written even when others fail; the
+        errors are reported with the index of their item.
+        """
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError(_("Expected a list of posts."))
+        if len(items) > settings.BLOG_BULK_MAX_ITEMS:
+            raise ValidationError(
+                _("At most %(count)d posts per request.")
+                % {"count": settings.BLOG_BULK_MAX_ITEMS}
+            )
+
+        writer = PostBulkWriter(
+            items, request.author_id, settings.BLOG_BULK_BATCH_SIZE
+        )
+        writer.validate()
+        writer.save()
+        result = writer.get_result()
+        if result["errors"] and not (result["created"] or result["updated"]):
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        return Response(result)
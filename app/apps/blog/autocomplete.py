@@ -0,0 +1,157 @@
+"""
+Prefix lookups behind the admin author and category pickers and the
+?prefix= filter of the category API.
+
+Each process keeps a sorted index of the lookup keys of a model in
+memory, as long as the table has at most BLOG_AUTOCOMPLETE_INDEX_MAX_ROWS
+rows. Saves in the process update it in place, saves elsewhere move the
+model version and the index is rebuilt on its next lookup. Larger tables
+are looked up through the prefix indexes of the database, and the
+results are cached against the model version.
+"""
+import hashlib
+import itertools
+import threading
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import get_versions
+from .models import Author, Category
+
+# Fields whose values a prefix is matched against, per model
+FIELDS = {
+    Category: ["title"],
+    Author: ["user__email", "last_name"],
+}
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def normalize(value):
+    return value.casefold()
+
+
+class PrefixIndex:
+    """
+    Sorted (key, pk) pairs of the rows of one model. A lookup searches
+    for the first key starting with the prefix and walks the keys after
+    it.
+    """
+
+    def __init__(self, rows):
+        self.keys = {}
+        self.entries = []
+        for pk, *values in rows:
+            self.keys[pk] = self.get_keys(values)
+            self.entries.extend((key, pk) for key in self.keys[pk])
+        self.entries.sort()
+
+    def get_keys(self, values):
+        return sorted({normalize(value) for value in values if value})
+
+    def add(self, pk, values):
+        self.remove(pk)
+        self.keys[pk] = self.get_keys(values)
+        for key in self.keys[pk]:
+            insort(self.entries, (key, pk))
+
+    def remove(self, pk):
+        for key in self.keys.pop(pk, []):
+            del self.entries[bisect_left(self.entries, (key, pk))]
+
+    def search(self, prefix, limit=None):
+        prefix = normalize(prefix)
+        position = bisect_left(self.entries, (prefix,))
+        pks = {}
+        for key, pk in itertools.islice(self.entries, position, None):
+            if not key.startswith(prefix) or len(pks) == limit:
+                break
+            pks[pk] = None
+        return list(pks)
+
+
+def get_index(model, version):
+    """
+    Returns the index of model at version, None when the table is too
+    large to hold in memory.
+    """
+    with _lock:
+        indexed_version, index = _indexes.get(model, (None, None))
+        if indexed_version != version:
+            queryset = model.objects.values_list("pk", *FIELDS[model])
+            max_rows = settings.BLOG_AUTOCOMPLETE_INDEX_MAX_ROWS
+            index = None
+            # Large tables are only counted again once their version moves
+            if queryset[: max_rows + 1].count() <= max_rows:
+                index = PrefixIndex(queryset.iterator())
+            _indexes[model] = version, index
+    return index
+
+
+def is_indexed(model):
+    """
+    Tells whether model is small enough for the index of this process.
+    """
+    (version,) = get_versions(model)
+    return get_index(model, version) is not None
+
+
+def update_index(model, pk):
+    """
+    Applies a saved or deleted row of model to the index of this
+    process, once its version was bumped for the change.
+    """
+    (version,) = get_versions(model)
+    with _lock:
+        indexed_version, index = _indexes.get(model, (None, None))
+        if index is None:
+            return
+        if indexed_version + 1 != version:
+            # Other processes changed the table too, rebuilt on lookup
+            del _indexes[model]
+            return
+        values = model.objects.filter(pk=pk).values_list(*FIELDS[model])
+        values = values.first()
+        if values is None:
+            index.remove(pk)
+        else:
+            index.add(pk, values)
+        _indexes[model] = version, index
+
+
+def search(model, prefix, limit=None):
+    """
+    Returns the pks of up to limit rows of model with a field value
+    starting with prefix, case insensitive, ordered by that value. On
+    tables too large for the index, which rows make the limit is up to
+    the database.
+    """
+    (version,) = get_versions(model)
+    index = get_index(model, version)
+    if index is not None:
+        return index.search(prefix, limit)
+
+    digest = hashlib.md5(normalize(prefix).encode()).hexdigest()
+    key = (
+        f"blog:autocomplete:{model._meta.label_lower}:{version}:"
+        f"{digest}:{limit}"
+    )
+    pks = cache.get(key)
+    if pks is None:
+        matches = []
+        for field in FIELDS[model]:
+            # Unordered, the first rows the prefix index finds end the
+            # scan, sorting every match of a short prefix would not
+            queryset = (
+                model.objects.filter(**{f"{field}__istartswith": prefix})
+                .order_by()
+                .values_list(field, "pk")
+            )
+            matches.extend(queryset[:limit])
+        matches.sort(key=lambda match: normalize(match[0]))
+        pks = list(dict.fromkeys(pk for value, pk in matches))[:limit]
+        cache.set(key, pks, timeout=settings.BLOG_RESPONSE_CACHE_TIMEOUT)
+    return pks
@@ -0,0 +1,408 @@
+"""
+Query-count, latency and memory benchmark of every API endpoint, run by
+manage.py benchmark_api against any database and by the test suite
+against a seeded test database. Both compare the results with the
+baseline in BENCHMARK_BASELINE, which the tests record at their default
+scale when run with BENCHMARK_SAVE_BASELINE=1. Query counts and memory
+are compared on every run; latency depends on the machine, the tests
+only compare it with BENCHMARK_LATENCY=1 on the machine that recorded
+the baseline.
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.accounts.api.tokens import RefreshToken
+from apps.blog.models import Category, Post
+from core.benchmarks import Timings, measure_memory
+
+User = get_user_model()
+
+PASSWORD = "Benchmark-Pass-1"
+
+# Allowed relative increase of latency and memory, and latency increases
+# in ms that count as noise
+TOLERANCE = 1.0
+MIN_DELTA = 10.0
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+class Scenario:
+    """
+    One endpoint call. url and data may be callables taking the fixtures
+    and the iteration number, evaluated before the timer starts.
+    """
+
+    def __init__(self, name, method, url, data=None, auth=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.data = data
+        self.auth = auth
+
+    def prepare(self, fixtures, iteration):
+        url = self.url(fixtures, iteration)
+        data = self.data(fixtures, iteration) if self.data else None
+        return url, data
+
+
+def post_url(name, **kwargs):
+    return lambda fixtures, iteration: reverse(
+        f"blog_api_1.0:{name}", kwargs=kwargs
+    )
+
+
+def own_post_url(fixtures, iteration):
+    return reverse("blog_api_1.0:post-detail", kwargs={"pk": fixtures.post.pk})
+
+
+def auth_url(name):
+    return lambda fixtures, iteration: reverse(f"accounts_api_1.0:{name}")
+
+
+def post_data(fixtures, iteration):
+    return {
+        "title": f"Benchmark post {iteration}",
+        "body": "Benchmark body",
+        "status": Post.STATUS_PUBLISHED,
+        "category": fixtures.category.pk,
+    }
+
+
+SCENARIOS = [
+    Scenario("blog index", "get", lambda f, i: reverse("blog:index")),
+    Scenario("category list", "get", post_url("category-list")),
+    Scenario(
+        "category detail",
+        "get",
+        lambda f, i: reverse(
+            "blog_api_1.0:category-detail", kwargs={"pk": f.category.pk}
+        ),
+    ),
+    Scenario("post list", "get", post_url("post-list")),
+    Scenario(
+        "post list page 3",
+        "get",
+        lambda f, i: reverse("blog_api_1.0:post-list") + "?page=3",
+    ),
+    Scenario(
+        "post list cursor",
+        "get",
+        lambda f, i: reverse("blog_api_1.0:post-list") + "?pagination=cursor",
+    ),
+    Scenario(
+        "post list filtered",
+        "get",
+        lambda f, i: reverse("blog_api_1.0:post-list")
+        + f"?category={f.category.pk}&from_date=2000-01-01T00:00:00Z",
+    ),
+    Scenario(
+        "post search",
+        "get",
+        lambda f, i: reverse("blog_api_1.0:post-list") + "?q=lorem",
+    ),
+    Scenario("post detail", "get", own_post_url),
+    Scenario(
+        "category prefix",
+        "get",
+        lambda f, i: reverse("blog_api_1.0:category-list") + "?prefix=Ben",
+    ),
+    Scenario("post export", "get", post_url("post-export")),
+    Scenario("async category list", "get", post_url("async:category-list")),
+    Scenario(
+        "async category detail",
+        "get",
+        lambda f, i: reverse(
+            "blog_api_1.0:async:category-detail", kwargs={"pk": f.category.pk}
+        ),
+    ),
+    Scenario("async post list", "get", post_url("async:post-list")),
+    Scenario(
+        "async post detail",
+        "get",
+        lambda f, i: reverse(
+            "blog_api_1.0:async:post-detail", kwargs={"pk": f.post.pk}
+        ),
+    ),
+    Scenario("post create", "post", post_url("post-list"), post_data, "token"),
+    Scenario("post update", "put", own_post_url, post_data, "token"),
+    Scenario(
+        "post partial update",
+        "patch",
+        own_post_url,
+        lambda f, i: {"title": f"Benchmark post {i}"},
+        "token",
+    ),
+    Scenario("post delete", "delete", own_post_url, auth="token"),
+    Scenario("author detail", "get", post_url("author-detail"), auth="token"),
+    Scenario(
+        "author update",
+        "patch",
+        post_url("author-detail"),
+        lambda f, i: {"first_name": f"Bench {i}"},
+        "token",
+    ),
+    Scenario(
+        "signup",
+        "post",
+        auth_url("signup"),
+        lambda f, i: {
+            "email": f"benchmark-signup-{i}@example.com",
+            "password": PASSWORD,
+            "confirm_password": PASSWORD,
+        },
+    ),
+    Scenario(
+        "account verify resend",
+        "post",
+        auth_url("account-verify-resend"),
+        lambda f, i: {"email": f.inactive_user.email},
+    ),
+    Scenario(
+        "account verify",
+        "get",
+        lambda f, i: reverse(
+            "accounts_api_1.0:account-verify",
+            kwargs={"token": f.token_for(f.inactive_user)},
+        ),
+    ),
+    Scenario(
+        "jwt create",
+        "post",
+        auth_url("jwt-create"),
+        lambda f, i: {"email": f.user.email, "password": PASSWORD},
+    ),
+    Scenario(
+        "jwt refresh",
+        "post",
+        auth_url("jwt-refresh"),
+        lambda f, i: {"refresh": str(RefreshToken.for_user(f.user))},
+    ),
+    Scenario(
+        "jwt verify",
+        "post",
+        auth_url("jwt-verify"),
+        lambda f, i: {"token": f.token},
+    ),
+    Scenario(
+        "password change",
+        "patch",
+        auth_url("password-change"),
+        lambda f, i: {
+            "old_password": PASSWORD,
+            "new_password1": PASSWORD,
+            "new_password2": PASSWORD,
+        },
+        "force",
+    ),
+    Scenario(
+        "password reset",
+        "post",
+        auth_url("password-reset"),
+        lambda f, i: {"email": f.user.email},
+    ),
+    Scenario(
+        "password reset confirm",
+        "get",
+        lambda f, i: reverse(
+            "accounts_api_1.0:password-reset",
+            kwargs={"token": f.token_for(f.user)},
+        ),
+    ),
+    Scenario(
+        "password reset complete",
+        "post",
+        auth_url("password-reset-complete"),
+        lambda f, i: {
+            "token": f.token_for(f.user),
+            "password1": PASSWORD,
+            "password2": PASSWORD,
+        },
+    ),
+    Scenario(
+        "schema",
+        "get",
+        lambda f, i: reverse("schema-json", kwargs={"format": ".json"}),
+    ),
+    Scenario(
+        "post bulk",
+        "post",
+        post_url("post-bulk"),
+        lambda f, i: [
+            {**post_data(f, i), "title": f"Benchmark bulk {i} {number}"}
+            for number in range(10)
+        ],
+        "token",
+    ),
+    Scenario(
+        "database metrics",
+        "get",
+        lambda f, i: reverse("metrics-db"),
+        auth="staff",
+    ),
+]
+
+
+class Fixtures:
+    def __init__(self):
+        self.user = User.objects.create_user(
+            "benchmark-api@example.com", PASSWORD, is_active=True
+        )
+        self.inactive_user = User.objects.create_user(
+            "benchmark-api-inactive@example.com", PASSWORD
+        )
+        self.staff_user = User.objects.create_user(
+            "benchmark-api-staff@example.com",
+            PASSWORD,
+            is_active=True,
+            is_staff=True,
+        )
+        self.category = Category.objects.create(title="Benchmark")
+        self.post = Post.objects.create(
+            title="Benchmark post",
+            body="Benchmark body",
+            status=Post.STATUS_PUBLISHED,
+            category=self.category,
+            author_id=self.user.pk,
+        )
+
+    @property
+    def token(self):
+        return self.token_for(self.user)
+
+    def token_for(self, user):
+        user.refresh_from_db(fields=["token_version"])
+        return str(RefreshToken.for_user(user).access_token)
+
+
+def run_scenario(scenario, fixtures, iterations):
+    """
+    Calls the endpoint of scenario iterations times on cold caches,
+    after an unmeasured warm-up call, and returns its query count, p50
+    and p95 latency in ms and peak memory in KiB. Streamed responses are
+    read to the end.
+    """
+    client = APIClient()
+    timings = Timings()
+    for iteration in range(iterations + 2):
+        url, data = scenario.prepare(fixtures, iteration)
+        if scenario.auth == "token":
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {fixtures.token}")
+        elif scenario.auth == "force":
+            client.force_authenticate(fixtures.user)
+        elif scenario.auth == "staff":
+            client.force_authenticate(fixtures.staff_user)
+        # Measure the uncached path of every request
+        cache.clear()
+
+        request = getattr(client, scenario.method)
+        if iteration == 0:
+            # Imports and lazy setup of the first call depend on what
+            # ran before in the process
+            response = read(request(url, data, format="json"))
+        elif iteration == 1:
+            # Count queries and memory on a separate run, tracing
+            # allocations slows requests down
+            reset_queries()
+            with CaptureQueriesContext(connection) as queries:
+                response, peak = measure_memory(
+                    lambda: read(request(url, data, format="json"))
+                )
+            # captured_queries reads the connection log lazily, and
+            # every request resets that log
+            query_count = len(queries)
+        else:
+            response = timings.time(
+                lambda: read(request(url, data, format="json"))
+            )
+
+        if response.status_code >= 400:
+            raise BenchmarkError(
+                f"{scenario.name}: HTTP {response.status_code}"
+            )
+
+    return {
+        "queries": query_count,
+        "p50": timings.percentile(50),
+        "p95": timings.percentile(95),
+        "peak_kib": peak / 1024,
+    }
+
+
+def read(response):
+    if response.streaming:
+        b"".join(response.streaming_content)
+    return response
+
+
+def run(scenarios, iterations, report=None):
+    """
+    Runs scenarios on fresh fixtures and returns their results by name.
+    The caller rolls the writes back.
+    """
+    fixtures = Fixtures()
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = run_scenario(scenario, fixtures, iterations)
+        if report is not None:
+            report(scenario.name, results[scenario.name])
+    cache.clear()
+    return results
+
+
+def load_baseline(path):
+    if not path.exists():
+        raise BenchmarkError(
+            f"No baseline at {path}, record one with "
+            "BENCHMARK_SAVE_BASELINE=1 pytest or benchmark_api "
+            "--save-baseline."
+        )
+    return json.loads(path.read_text())
+
+
+def save_baseline(path, results):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results, baseline, tolerance, min_delta, latency=True):
+    """
+    Returns a message per result above its baseline: more queries, or
+    memory and, with latency, median latency beyond the relative
+    tolerance. Latency within min_delta ms of the baseline is noise, and
+    so is p95 over a few iterations. Scenarios missing from the baseline
+    fail too.
+    """
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            failures.append(f"{name}: not in the baseline")
+            continue
+        if result["queries"] > expected["queries"]:
+            failures.append(
+                f"{name}: {result['queries']} queries, "
+                f"baseline {expected['queries']}"
+            )
+        metrics = [("peak_kib", 0)]
+        if latency:
+            metrics.append(("p50", min_delta))
+        for metric, floor in metrics:
+            limit = max(
+                expected[metric] * (1 + tolerance),
+                expected[metric] + floor,
+            )
+            if result[metric] > limit:
+                failures.append(
+                    f"{name}: {metric} {result[metric]:.2f}, "
+                    f"baseline {expected[metric]:.2f}"
+                )
+    return failures
@@ -0,0 +1,57 @@
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_KEY = "blog:version:{}"
+
+
+def get_version_key(model):
+    return VERSION_KEY.format(model._meta.label_lower)
+
+
+def get_versions(*models):
+    """
+    Returns the current version counter of each model.
+    """
+    keys = [get_version_key(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Start evicted or unset counters from a fresh value so that
+            # entries cached under an older counter are never reused.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+async def aget_versions(*models):
+    """
+    Async counterpart of get_versions.
+    """
+    keys = [get_version_key(model) for model in models]
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            versions[key] = await cache.aget(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(*models, using=None):
+    """
+    Invalidates everything cached against these models once the current
+    transaction on the database using commits. Bumped earlier, readers
+    could cache the rows it is about to replace under the new version.
+    """
+    transaction.on_commit(partial(_bump_version, models), using=using)
+
+
+def _bump_version(models):
+    for model in models:
+        key = get_version_key(model)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), timeout=None)
@@ -0,0 +1,181 @@
+from collections import defaultdict
+
+from django.db import router, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .cache import bump_version
+from .models import Author, Category, Post
+
+# Counted relations of a post, in the order of a state tuple
+RELATIONS = [(Category, "category"), (Author, "author")]
+COUNTED_FIELDS = {
+    "category",
+    "category_id",
+    "author",
+    "author_id",
+    "status",
+    "is_active",
+}
+PUBLISHED = Q(is_active=True, status=Post.STATUS_PUBLISHED)
+
+
+def get_state(post):
+    """
+    Returns what the counters know about a post: its category, its
+    author and whether Post.published includes it.
+    """
+    return (
+        post.category_id,
+        post.author_id,
+        post.is_active and post.status == Post.STATUS_PUBLISHED,
+    )
+
+
+def get_states(queryset):
+    """
+    Returns the state of every post of queryset by pk, locking the posts
+    until the transaction ends.
+    """
+    # The database queryset writes to, never a replica
+    using = queryset.select_for_update().db
+    posts = (
+        Post.objects.using(using)
+        .filter(pk__in=queryset.values("pk"))
+        .select_for_update()
+        .order_by()
+    )
+    return {
+        pk: (
+            category_id,
+            author_id,
+            is_active and status == Post.STATUS_PUBLISHED,
+        )
+        for pk, category_id, author_id, status, is_active in (
+            posts.values_list(
+                "pk", "category_id", "author_id", "status", "is_active"
+            )
+        )
+    }
+
+
+def update_counters(previous, current, using=None):
+    """
+    Applies the difference between two {pk: state} dicts to the counters.
+    A pk missing from previous is a new post, one missing from current a
+    deleted post. Rows sharing the same difference take one UPDATE.
+    Responses showing the counters are cached on the Post version, which
+    every post write bumps.
+    """
+    deltas = {model: defaultdict(lambda: [0, 0]) for model, name in RELATIONS}
+    for pk in previous.keys() | current.keys():
+        for state, sign in [(previous.get(pk), -1), (current.get(pk), 1)]:
+            if state is None:
+                continue
+            *related, published = state
+            for (model, name), related_pk in zip(RELATIONS, related):
+                delta = deltas[model][related_pk]
+                delta[0] += sign
+                delta[1] += sign * published
+
+    for model, rows in deltas.items():
+        groups = defaultdict(list)
+        for related_pk, (total, published) in rows.items():
+            if total or published:
+                groups[total, published].append(related_pk)
+        for (total, published), pks in groups.items():
+            model.objects.using(using).filter(pk__in=sorted(pks)).update(
+                posts_count=F("posts_count") + total,
+                published_posts_count=F("published_posts_count") + published,
+            )
+
+
+def update_posts(queryset, **values):
+    """
+    queryset.update(**values) that keeps the counters right. Returns the
+    number of updated posts.
+    """
+    # update() skips auto_now, conditional requests rely on updated_at
+    values.setdefault("updated_at", timezone.now())
+    using = router.db_for_write(Post)
+    with transaction.atomic(using=using):
+        previous = get_states(queryset.using(using))
+        posts = Post.objects.using(using).filter(pk__in=list(previous))
+        updated = posts.update(**values)
+        update_counters(previous, get_states(posts), using)
+    bump_version(Post, using=using)
+    return updated
+
+
+def iter_pk_chunks(queryset, chunk_size):
+    """
+    Yields the pks of queryset in ascending lists of up to chunk_size,
+    one indexed range query per chunk. Rows the previous chunks changed
+    no longer need to match queryset.
+    """
+    queryset = queryset.using(router.db_for_write(Post)).order_by("pk")
+    last_pk = None
+    while True:
+        chunk = queryset
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def update_posts_in_chunks(queryset, chunk_size, **values):
+    """
+    update_posts() over chunks of chunk_size posts in pk order, each in
+    its own transaction, so that posts and counters are only locked for
+    one chunk at a time. Yields the number of updated posts per chunk.
+    Stopped midway, the chunks done stay updated and running it again
+    updates the rest.
+    """
+    for pks in iter_pk_chunks(queryset, chunk_size):
+        yield update_posts(Post.objects.filter(pk__in=pks), **values)
+
+
+def rebuild_counters(model, batch_size=500):
+    """
+    Recounts the posts of every row of model, a batch of rows per
+    transaction. Yields the number of corrected rows per batch.
+    """
+    name = dict((model, name) for model, name in RELATIONS)[model]
+    pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(pks), batch_size):
+        end = start + batch_size
+        with transaction.atomic():
+            # Post writes wait for the locked rows to update their counters,
+            # so the count below misses none of them
+            rows = model.objects.filter(pk__in=pks[start:end])
+            rows = rows.select_for_update().in_bulk()
+            counts = (
+                Post.objects.filter(**{f"{name}__in": list(rows)})
+                .order_by()
+                .values_list(name)
+                .annotate(
+                    total=Count("pk"), published=Count("pk", filter=PUBLISHED)
+                )
+            )
+            counts = {
+                pk: (total, published) for pk, total, published in counts
+            }
+            changed = []
+            for pk, row in rows.items():
+                total, published = counts.get(pk, (0, 0))
+                if (row.posts_count, row.published_posts_count) != (
+                    total,
+                    published,
+                ):
+                    row.posts_count = total
+                    row.published_posts_count = published
+                    changed.append(row)
+            model.objects.bulk_update(
+                changed, ["posts_count", "published_posts_count"]
+            )
+        if changed:
+            bump_version(model)
+        yield len(changed)
@@ -0,0 +1,82 @@
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.benchmarks import Timings
+
+User = get_user_model()
+
+EMAIL = "benchmark-admin@example.com"
+
+SCENARIOS = [
+    ("posts", "/admin/blog/post/", ""),
+    ("posts page 500", "/admin/blog/post/", "p=500"),
+    ("posts filtered", "/admin/blog/post/", "status__exact=pub"),
+    ("posts search", "/admin/blog/post/", "q=lorem"),
+    ("users", "/admin/accounts/user/", ""),
+    ("users search", "/admin/accounts/user/", "q=seed12345"),
+    ("authors search", "/admin/blog/author/", "q=seed12345"),
+    ("categories search", "/admin/blog/category/", "q=category"),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Times admin changelists with exact counts against estimated "
+        "counts. Seed a large database first, e.g. seed_blog --posts "
+        "1000000 --authors 1000000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+
+    @override_settings(DEBUG=False, ALLOWED_HOSTS=["*"])
+    def handle(self, *args, **options):
+        user, _ = User.objects.get_or_create(
+            email=EMAIL,
+            defaults={
+                "is_active": True,
+                "is_staff": True,
+                "is_superuser": True,
+            },
+        )
+        client = Client()
+        client.force_login(user)
+        try:
+            for estimated in [False, True]:
+                with override_settings(ADMIN_ESTIMATED_COUNTS=estimated):
+                    self.run_mode(client, estimated, options["repeat"])
+        finally:
+            for model_admin in admin.site._registry.values():
+                model_admin.__dict__.pop("show_full_result_count", None)
+            user.delete()
+
+    def run_mode(self, client, estimated, repeat):
+        self.stdout.write("estimated counts" if estimated else "exact counts")
+        for model_admin in admin.site._registry.values():
+            # The full count is shown next to filtered counts by default
+            model_admin.show_full_result_count = not estimated
+        cache.clear()
+
+        for name, path, query in SCENARIOS:
+            timings = Timings()
+            for _ in range(repeat):
+                with CaptureQueriesContext(connection) as queries:
+                    response = timings.time(client.get, f"{path}?{query}")
+                    # Captured queries are lost at the next request
+                    slowest = max(float(q["time"]) for q in queries)
+                    query_count = len(queries)
+                if response.status_code != 200:
+                    self.stderr.write(f"{name}: HTTP {response.status_code}")
+                    break
+            else:
+                self.stdout.write(
+                    f"  {name}: first {timings[0] * 1000:.1f} ms, "
+                    f"{timings.describe((50,))}, "
+                    f"{query_count} queries, "
+                    f"slowest {slowest * 1000:.1f} ms"
+                )
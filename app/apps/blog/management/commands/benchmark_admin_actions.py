@@ -0,0 +1,93 @@
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, connections
+
+from apps.blog.counters import update_posts, update_posts_in_chunks
+from apps.blog.models import Post
+from core.benchmarks import Timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Sets the latest published posts as published again, once in a "
+        "single update and once in chunks like the admin status actions, "
+        "while another thread keeps reading posts and saving one of them. "
+        "Reports how long the reads and saves waited; chunked, no wait "
+        "should last the whole update."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=5000)
+        parser.add_argument("--chunk-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.filter(status=Post.STATUS_PUBLISHED)
+        limit = options["posts"]
+        pks = queryset.order_by("-pk").values_list("pk", flat=True)
+        pks = list(pks[:limit])
+        if not pks:
+            raise CommandError("No published post, run seed_blog first.")
+        queryset = queryset.filter(pk__gte=pks[-1])
+
+        def single():
+            return [update_posts(queryset, status=Post.STATUS_PUBLISHED)]
+
+        def chunked():
+            return list(
+                update_posts_in_chunks(
+                    queryset,
+                    options["chunk_size"],
+                    status=Post.STATUS_PUBLISHED,
+                )
+            )
+
+        for name, action in [("single update", single), ("chunked", chunked)]:
+            self.run_action(name, action, pks[0])
+
+    def run_action(self, name, action, pk):
+        timings = {"read": Timings(), "save": Timings()}
+        errors = []
+        done = threading.Event()
+
+        def client():
+            try:
+                while not done.is_set():
+                    with timings["read"].measure():
+                        list(Post.published.order_by("-pk")[:10])
+
+                    # Locks the post like an edit in the admin
+                    with timings["save"].measure():
+                        Post.objects.get(pk=pk).save()
+            except DatabaseError as exc:
+                errors.append(exc)
+            finally:
+                connections.close_all()
+
+        thread = threading.Thread(target=client)
+        elapsed = Timings()
+        thread.start()
+        try:
+            chunks = elapsed.time(action)
+        except DatabaseError as exc:
+            # SQLite fails writers that wait on each other's locks
+            self.stderr.write(f"{name} failed: {exc}")
+            chunks = None
+        finally:
+            done.set()
+            thread.join()
+
+        if chunks is not None:
+            self.stdout.write(
+                f"{name}: {sum(chunks)} posts in {len(chunks)} "
+                f"transactions, {elapsed.total * 1000:.1f} ms"
+            )
+        for kind, values in timings.items():
+            if values:
+                self.stdout.write(
+                    f"  {kind}: {len(values)} done, "
+                    f"{values.describe((50, 99))}, "
+                    f"max {max(values) * 1000:.1f} ms"
+                )
+        for exc in errors:
+            self.stderr.write(f"  client failed: {exc}")
@@ -0,0 +1,87 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from apps.blog import benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs every API endpoint against the current database, records "
+        "query counts, p50/p95 latency and peak memory, and compares them "
+        "with a stored baseline. Seed data first with seed_blog. All "
+        "changes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument(
+            "--baseline", default=str(settings.BENCHMARK_BASELINE)
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Store the results as the new baseline.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=benchmarks.TOLERANCE,
+            help="Allowed relative increase of latency and memory.",
+        )
+        parser.add_argument(
+            "--min-delta",
+            type=float,
+            default=benchmarks.MIN_DELTA,
+            help="Latency increases below this many ms are noise.",
+        )
+        parser.add_argument(
+            "--only", nargs="*", help="Names of the scenarios to run."
+        )
+
+    # DEBUG would turn on the debug toolbar for the test client
+    @override_settings(DEBUG=False, JOBS_RUN_IN_PROCESS=False)
+    def handle(self, *args, **options):
+        scenarios = [
+            scenario
+            for scenario in benchmarks.SCENARIOS
+            if not options["only"] or scenario.name in options["only"]
+        ]
+
+        try:
+            with transaction.atomic():
+                results = benchmarks.run(
+                    scenarios, options["iterations"], self.report
+                )
+                transaction.set_rollback(True)
+
+            baseline_path = Path(options["baseline"])
+            if options["save_baseline"]:
+                benchmarks.save_baseline(baseline_path, results)
+                self.stdout.write(f"Baseline saved to {baseline_path}.")
+                return
+
+            failures = benchmarks.compare(
+                results,
+                benchmarks.load_baseline(baseline_path),
+                options["tolerance"],
+                options["min_delta"],
+            )
+        except benchmarks.BenchmarkError as exc:
+            raise CommandError(exc)
+        if failures:
+            raise CommandError(
+                "Regressions against the baseline:\n" + "\n".join(failures)
+            )
+        self.stdout.write(self.style.SUCCESS("Within the baseline."))
+
+    def report(self, name, result):
+        self.stdout.write(
+            "{name}: {queries} queries, p50 {p50:.2f} ms, "
+            "p95 {p95:.2f} ms, peak {peak_kib:.0f} KiB".format(
+                name=name, **result
+            )
+        )
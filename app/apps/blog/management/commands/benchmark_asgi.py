@@ -0,0 +1,200 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+
+from apps.blog.models import Post
+from core.benchmarks import Timings, run_threads
+
+SYNC_PREFIX = "/api-1.0/blog/"
+ASYNC_PREFIX = "/api-1.0/blog/async/"
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares throughput and tail latency of the sync blog read "
+        "endpoints behind a fixed number of WSGI worker threads with the "
+        "async endpoints on one ASGI event loop, under concurrent clients "
+        "and an artificial delay added to every database query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Clients sending requests at the same time.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="WSGI worker threads, like gunicorn --threads.",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=5.0,
+            help="Milliseconds added to every database query.",
+        )
+
+    # Responses must come from the database and not from the cache
+    @override_settings(
+        DEBUG=False,
+        ALLOWED_HOSTS=["*"],
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            }
+        },
+    )
+    def handle(self, *args, **options):
+        post = Post.published.first()
+        if post is None:
+            raise CommandError("No published post, run seed_blog first.")
+        self.paths = [
+            ("posts/", ""),
+            ("posts/", "page=2"),
+            (f"posts/{post.pk}/", ""),
+            ("categories/", ""),
+        ]
+
+        delay = options["latency"] / 1000
+
+        def delay_query(execute, *args):
+            time.sleep(delay)
+            return execute(*args)
+
+        def add_delay(connection, **kwargs):
+            # Wrappers outlive reconnections of the same connection object
+            if delay_query not in connection.execute_wrappers:
+                connection.execute_wrappers.append(delay_query)
+
+        connections.close_all()
+        connection_created.connect(add_delay)
+        try:
+            wsgi = self.run_wsgi(options)
+            asgi = asyncio.run(self.run_asgi(options))
+        finally:
+            connection_created.disconnect(add_delay)
+            connections.close_all()
+
+        for name, (elapsed, timings) in [("WSGI", wsgi), ("ASGI", asgi)]:
+            self.stdout.write(
+                f"{name}: {timings.rate(elapsed):.0f} req/s, "
+                f"{timings.describe((50, 99))}"
+            )
+
+    def get_path(self, index):
+        return self.paths[index % len(self.paths)]
+
+    def run_wsgi(self, options):
+        """
+        Client threads hand their requests to a fixed pool of worker
+        threads, which serves them first in, first out like the accept
+        queue of a WSGI server.
+        """
+        application = get_wsgi_application()
+        counter = iter(range(options["requests"]))
+        lock = threading.Lock()
+        timings = Timings()
+
+        def serve(path, query):
+            self.call_wsgi(application, SYNC_PREFIX + path, query)
+
+        with ThreadPoolExecutor(options["workers"]) as workers:
+
+            def client():
+                while True:
+                    with lock:
+                        index = next(counter, None)
+                    if index is None:
+                        break
+                    future = workers.submit(serve, *self.get_path(index))
+                    timings.time(future.result)
+
+            elapsed = run_threads(client, options["concurrency"])
+        return elapsed, timings
+
+    def call_wsgi(self, application, path, query):
+        environ = {
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "HTTP_ACCEPT": "application/json",
+            "wsgi.input": BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        body = b"".join(
+            application(
+                environ, lambda status, headers: statuses.append(status)
+            )
+        )
+        if not statuses[0].startswith("200"):
+            raise CommandError(f"{path}: {statuses[0]} {body[:200]}")
+
+    async def run_asgi(self, options):
+        application = get_asgi_application()
+        counter = iter(range(options["requests"]))
+        timings = Timings()
+
+        async def client():
+            for index in counter:
+                path, query = self.get_path(index)
+                await timings.atime(
+                    self.call_asgi(application, ASYNC_PREFIX + path, query)
+                )
+
+        elapsed = Timings()
+        with elapsed.measure():
+            await asyncio.gather(
+                *[client() for _ in range(options["concurrency"])]
+            )
+        return elapsed.total, timings
+
+    async def call_asgi(self, application, path, query):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "root_path": "",
+            "query_string": query.encode(),
+            "headers": [(b"host", b"localhost")],
+            "client": ("127.0.0.1", 0),
+            "server": ("localhost", 80),
+        }
+        done = asyncio.Event()
+        messages = []
+
+        async def receive():
+            if not messages:
+                messages.append(None)
+                return {"type": "http.request", "body": b""}
+            await done.wait()
+            return {"type": "http.disconnect"}
+
+        response = {}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif not message.get("more_body"):
+                done.set()
+
+        await application(scope, receive, send)
+        if response["status"] != 200:
+            raise CommandError(f"{path}: HTTP {response['status']}")
@@ -0,0 +1,53 @@
+import random
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from apps.blog import autocomplete
+from apps.blog.admin import search_autocomplete
+from apps.blog.models import Author, Category
+from core.benchmarks import Timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Times autocomplete lookups of authors and categories for every "
+        "prefix of sampled emails and titles, as typed into the admin "
+        "pickers, and reports p50 and p95 latencies."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=50)
+
+    def handle(self, *args, **options):
+        # The first page of the picker
+        request = RequestFactory().get("/")
+        for model in [Category, Author]:
+            field = autocomplete.FIELDS[model][0]
+            values = model.objects.order_by("?").values_list(field, flat=True)
+            values = list(values[: options["samples"]])
+            prefixes = [
+                value[:length]
+                for value in values
+                for length in range(1, min(len(value), 12) + 1)
+            ]
+            random.shuffle(prefixes)
+            cache.clear()
+            # The first lookup builds the index of small tables
+            built = Timings()
+            built.time(autocomplete.search, model, "", limit=1)
+
+            timings = Timings()
+            for prefix in prefixes:
+                with timings.measure():
+                    queryset, _ = search_autocomplete(
+                        request, model.objects.all(), prefix
+                    )
+                    list(queryset)
+            self.stdout.write(
+                f"{model._meta.verbose_name_plural}: "
+                f"{len(timings)} lookups, "
+                f"first {built.percentile(50):.1f} ms, "
+                f"{timings.describe(digits=2)}"
+            )
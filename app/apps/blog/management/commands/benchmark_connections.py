@@ -0,0 +1,141 @@
+import threading
+from io import BytesIO
+from wsgiref.util import setup_testing_defaults
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+
+from apps.blog.models import Post
+from core.benchmarks import run_threads
+from core.db.backends.postgresql.base import DatabaseWrapper
+
+MODES = {
+    # Django's default, one new connection per request
+    "connect": {"CONN_MAX_AGE": 0},
+    "persistent": {"CONN_MAX_AGE": 600},
+    "pool": {"CONN_MAX_AGE": 0, "pool": True},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests a post detail endpoint through the WSGI handler with "
+        "a new connection per request, persistent connections and the "
+        "connection pool, and reports the connection acquisition cost per "
+        "request. Needs DB_ENGINE=postgresql."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Worker threads, like gunicorn --threads.",
+        )
+        parser.add_argument(
+            "--pool-size",
+            type=int,
+            default=4,
+            help="Maximum connections in the pool.",
+        )
+
+    # Responses must come from the database and not from the cache
+    @override_settings(
+        DEBUG=False,
+        ALLOWED_HOSTS=["*"],
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache"
+            }
+        },
+    )
+    def handle(self, *args, **options):
+        wrapper = connections[DEFAULT_DB_ALIAS]
+        if not isinstance(wrapper, DatabaseWrapper):
+            raise CommandError(
+                "The default database does not use the PostgreSQL backend "
+                "of core.db, set DB_ENGINE=postgresql."
+            )
+        post = Post.published.first()
+        if post is None:
+            raise CommandError("No published post, run seed_blog first.")
+        self.path = f"/api-1.0/blog/posts/{post.pk}/"
+        self.application = get_wsgi_application()
+
+        # Shared by the wrappers of every thread
+        settings_dict = wrapper.settings_dict
+        saved = {
+            "CONN_MAX_AGE": settings_dict["CONN_MAX_AGE"],
+            "OPTIONS": settings_dict["OPTIONS"],
+        }
+        connections.close_all()
+        wrapper.close_pool()
+        try:
+            for mode, values in MODES.items():
+                settings_dict["CONN_MAX_AGE"] = values["CONN_MAX_AGE"]
+                settings_dict["OPTIONS"] = {**saved["OPTIONS"]}
+                settings_dict["OPTIONS"].pop("pool", None)
+                if values.get("pool"):
+                    settings_dict["OPTIONS"]["pool"] = {
+                        "min_size": options["threads"],
+                        "max_size": options["pool_size"],
+                    }
+                self.report(mode, wrapper, options)
+                wrapper.close_pool()
+        finally:
+            settings_dict.update(saved)
+            connections.close_all()
+
+    def report(self, mode, wrapper, options):
+        before = wrapper.metrics.as_dict()
+        elapsed = self.run(options)
+        after = wrapper.metrics.as_dict()
+
+        total = options["requests"]
+        acquired = after["acquired"] - before["acquired"]
+        acquire_ms = after["acquire_ms_total"] - before["acquire_ms_total"]
+        self.stdout.write(
+            f"{mode}: {total / elapsed:.0f} req/s, "
+            f"{elapsed * 1000 / total:.2f} ms/request, "
+            f"{after['opened'] - before['opened']} connections opened, "
+            f"{acquired} acquired, "
+            f"{acquire_ms / total:.3f} ms acquiring per request"
+        )
+
+    def run(self, options):
+        counter = iter(range(options["requests"]))
+        lock = threading.Lock()
+
+        def work():
+            try:
+                while True:
+                    with lock:
+                        index = next(counter, None)
+                    if index is None:
+                        break
+                    self.call_wsgi()
+            finally:
+                # Persistent connections of a thread die with it
+                connections.close_all()
+
+        return run_threads(work, options["threads"])
+
+    def call_wsgi(self):
+        environ = {
+            "PATH_INFO": self.path,
+            "HTTP_ACCEPT": "application/json",
+            "wsgi.input": BytesIO(),
+        }
+        setup_testing_defaults(environ)
+        statuses = []
+        response = self.application(
+            environ, lambda status, headers: statuses.append(status)
+        )
+        body = b"".join(response)
+        # Sends request_finished, which closes or returns the connection
+        response.close()
+        if not statuses[0].startswith("200"):
+            raise CommandError(f"{self.path}: {statuses[0]} {body[:200]}")
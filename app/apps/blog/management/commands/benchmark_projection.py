@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router, transaction
+from rest_framework.test import APIRequestFactory
+
+from apps.blog.api.v1.views import PostViewSet
+from apps.blog.models import Author, Category, Post
+from core.benchmarks import measure_memory
+
+
+class Command(BaseCommand):
+    help = (
+        "Measures the bytes fetched and the peak memory of one post list "
+        "page with large bodies, loading every column versus the "
+        "projection PostViewSet uses. All changes are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--page-size", type=int, default=50)
+        parser.add_argument(
+            "--body-size",
+            type=int,
+            default=100_000,
+            help="Number of characters of each post body.",
+        )
+
+    def handle(self, *args, **options):
+        category = Category.objects.first()
+        author = Author.objects.first()
+        if category is None or author is None:
+            raise CommandError("No category or author, run seed_blog first.")
+
+        page_size = options["page_size"]
+        with transaction.atomic():
+            Post.objects.bulk_create(
+                Post(
+                    title=f"Projection {index}",
+                    slug=f"benchmark-projection-{index}",
+                    body="x" * options["body_size"],
+                    status=Post.STATUS_PUBLISHED,
+                    category=category,
+                    author=author,
+                )
+                for index in range(page_size)
+            )
+            full = Post.published.select_related(
+                "category", "author__user"
+            ).order_by("-created_at")[:page_size]
+            projected = self.get_list_queryset(page_size)
+            for name, queryset in [
+                ("all columns", full),
+                ("projection", projected),
+            ]:
+                fetched = self.get_fetched_bytes(queryset)
+                peak = self.get_peak_memory(queryset)
+                self.stdout.write(
+                    f"{name}: {fetched / 1024:.0f} KiB fetched, "
+                    f"peak {peak / 1024:.0f} KiB per page of {page_size}"
+                )
+            transaction.set_rollback(True)
+
+    def get_list_queryset(self, page_size):
+        view = PostViewSet(action_map={"get": "list"}, args=(), kwargs={})
+        view.format_kwarg = None
+        view.request = view.initialize_request(APIRequestFactory().get("/"))
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:page_size]
+
+    def get_fetched_bytes(self, queryset):
+        """
+        Sums the size of every value the database returns for queryset.
+        """
+        sql, params = queryset.query.sql_with_params()
+        connection = connections[router.db_for_read(Post)]
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return sum(
+            len(value.encode()) if isinstance(value, str) else len(str(value))
+            for row in rows
+            for value in row
+        )
+
+    def get_peak_memory(self, queryset):
+        return measure_memory(list, queryset.all())[1]
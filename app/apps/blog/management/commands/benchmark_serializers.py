@@ -0,0 +1,71 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIRequestFactory
+
+from apps.blog.api.v1.serializers import PostReadSerializer, PostSerializer
+from apps.blog.api.v1.views import PostViewSet
+from apps.blog.models import Post
+from core.benchmarks import Timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares the per-row cost of PostSerializer on model instances "
+        "with PostReadSerializer on values() rows, fetch included."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        queryset = Post.published.order_by("-created_at")
+        rows = queryset.count()
+        if rows < options["rows"]:
+            raise CommandError(
+                f"Only {rows} published posts, seed more with seed_blog."
+            )
+
+        for action in ["list", "retrieve"]:
+            context = self.get_context(action)
+            model = self.measure(
+                lambda: PostSerializer(
+                    queryset.select_related("category", "author__user")[
+                        : options["rows"]
+                    ],
+                    many=True,
+                    context=context,
+                ).data,
+                options,
+            )
+            compiled = self.measure(
+                lambda: PostReadSerializer(
+                    PostReadSerializer.project(queryset, action)[
+                        : options["rows"]
+                    ],
+                    many=True,
+                    context=context,
+                ).data,
+                options,
+            )
+            self.stdout.write(
+                f"{action}: PostSerializer {model:.1f} us/row, "
+                f"PostReadSerializer {compiled:.1f} us/row, "
+                f"{model / compiled:.1f}x faster"
+            )
+
+    def get_context(self, action):
+        """
+        Builds the context a PostViewSet request for action would pass.
+        """
+        kwargs = {"pk": 1} if action == "retrieve" else {}
+        view = PostViewSet(action_map={"get": action}, args=(), kwargs=kwargs)
+        view.action = action
+        request = view.initialize_request(APIRequestFactory().get("/"))
+        request.parser_context["kwargs"] = kwargs
+        return {"request": request, "view": view}
+
+    def measure(self, serialize, options):
+        timings = Timings()
+        for _ in range(options["repeat"]):
+            data = timings.time(serialize)
+        return min(timings) / len(data) * 1_000_000
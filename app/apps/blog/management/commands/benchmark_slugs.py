@@ -0,0 +1,65 @@
+import threading
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection
+
+from apps.blog.models import Author, Category, Post
+from core.benchmarks import run_threads
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests slug allocation: many threads create posts with the "
+        "same title at once. Fails on any IntegrityError or duplicate "
+        "slug. The posts are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--posts", type=int, default=50)
+        parser.add_argument("--title", default="Load tested title")
+
+    def handle(self, *args, **options):
+        category = Category.objects.first()
+        author = Author.objects.first()
+        if category is None or author is None:
+            raise CommandError("No category or author, run seed_blog first.")
+
+        errors = Counter()
+        pks = []
+        barrier = threading.Barrier(options["writers"])
+
+        def write():
+            barrier.wait()
+            try:
+                for _ in range(options["posts"]):
+                    try:
+                        post = Post.objects.create(
+                            title=options["title"],
+                            body="Load test",
+                            category=category,
+                            author=author,
+                        )
+                        pks.append(post.pk)
+                    except IntegrityError:
+                        errors["IntegrityError"] += 1
+            finally:
+                connection.close()
+
+        elapsed = run_threads(write, options["writers"])
+
+        posts = Post.objects.filter(pk__in=pks)
+        slugs = list(posts.values_list("slug", flat=True))
+        duplicates = len(slugs) - len(set(slugs))
+        posts.delete()
+
+        total = options["writers"] * options["posts"]
+        self.stdout.write(
+            f"{len(pks)}/{total} posts in {elapsed:.2f} s "
+            f"({len(pks) / elapsed:.0f} posts/s), "
+            f"{sum(errors.values())} IntegrityErrors, "
+            f"{duplicates} duplicate slugs"
+        )
+        if errors or duplicates or len(pks) != total:
+            raise CommandError("Slug allocation is not collision-free.")
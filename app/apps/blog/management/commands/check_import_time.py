@@ -0,0 +1,96 @@
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+ENTRY_POINTS = ["core.wsgi", "core.asgi"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports the WSGI and ASGI entry points in fresh interpreters "
+        "under python -X importtime, which includes django.setup(), and "
+        "reports the slowest packages. Exits with an error when a cold "
+        "start takes longer than the budget. Run it with the settings and "
+        "DEBUG value of production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modules", nargs="*", default=ENTRY_POINTS, metavar="module"
+        )
+        parser.add_argument(
+            "--budget",
+            type=float,
+            default=1000.0,
+            help="Milliseconds a cold start may take.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Interpreters started per module, the median counts.",
+        )
+        parser.add_argument("--top", type=int, default=10)
+
+    def handle(self, *args, **options):
+        over_budget = []
+        for module in options["modules"]:
+            runs = [self.run(module) for _ in range(options["repeat"])]
+            total = statistics.median(sum(run.values()) for run in runs)
+            self.stdout.write(
+                f"{module}: {total:.1f} ms, budget {options['budget']:.0f} ms"
+            )
+            # Packages by the median time spent in their own modules
+            packages = sorted(
+                runs[0],
+                key=lambda name: statistics.median(
+                    run.get(name, 0) for run in runs
+                ),
+                reverse=True,
+            )
+            for name in packages[: options["top"]]:
+                package_ms = statistics.median(
+                    run.get(name, 0) for run in runs
+                )
+                self.stdout.write(f"  {name}: {package_ms:.1f} ms")
+            if total > options["budget"]:
+                over_budget.append(module)
+
+        if over_budget:
+            raise CommandError(
+                f"{', '.join(over_budget)} over the import time budget."
+            )
+        self.stdout.write(self.style.SUCCESS("Cold starts within budget."))
+
+    def run(self, module):
+        """
+        Imports module in a new interpreter and returns the milliseconds
+        spent in the modules of every top-level package.
+        """
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE,
+        }
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=settings.BASE_DIR,
+        )
+        if result.returncode:
+            raise CommandError(f"Importing {module} failed:\n{result.stderr}")
+
+        packages = defaultdict(float)
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            own, cumulative, name = line.partition(":")[2].split("|")
+            packages[name.strip().split(".")[0]] += int(own) / 1000
+        return packages
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.blog.models import Category
+from apps.blog.query_plans import get_cases, get_list_queryset, get_plan
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks that PostViewSet list queries use the published-post "
+        "indexes. Exits with an error when a query plan misses its index."
+    )
+
+    def handle(self, *args, **options):
+        category = Category.objects.order_by("pk").first()
+        failures = []
+        for name, params, index in get_cases(category.pk if category else 1):
+            plan = get_plan(get_list_queryset(params))
+            if index in plan:
+                self.stdout.write(f"{name}: uses {index}")
+            else:
+                failures.append(name)
+                self.stderr.write(f"{name}: does not use {index}\n{plan}")
+
+        if failures:
+            raise CommandError(
+                f"{len(failures)} query plan(s) missed their index."
+            )
+        self.stdout.write(self.style.SUCCESS("All query plans use indexes."))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.schema import FORMATS, generate, get_path
+
+
+class Command(BaseCommand):
+    help = (
+        "Writes the OpenAPI schema of the API to API_SCHEMA_DIR, the "
+        "files the schema routes serve. Run it whenever the API changes. "
+        "With --check, only exits with an error when the files differ "
+        "from the schema of the current code."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail on out of date files instead of writing them.",
+        )
+
+    def handle(self, *args, **options):
+        stale = []
+        for format in FORMATS:
+            path = get_path(format)
+            content = generate(format)
+            if path.exists() and path.read_bytes() == content:
+                self.stdout.write(f"{path.name} is up to date.")
+            elif options["check"]:
+                stale.append(path.name)
+                self.stderr.write(f"{path.name} is out of date.")
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(content)
+                self.stdout.write(f"{path.name} written.")
+
+        if stale:
+            raise CommandError(
+                f"{', '.join(stale)} out of date, run manage.py "
+                f"generate_schema."
+            )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog.counters import rebuild_counters
+from apps.blog.models import Author, Category
+
+
+class Command(BaseCommand):
+    help = (
+        "Recounts the total and published posts of every category and "
+        "author in batches, and fixes the counters that drifted."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in [Category, Author]:
+            fixed = sum(rebuild_counters(model, options["batch_size"]))
+            self.stdout.write(
+                f"{fixed} {model._meta.verbose_name_plural} fixed."
+            )
+        self.stdout.write(self.style.SUCCESS("Post counters rebuilt."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.blog import search
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of posts."
+
+    def handle(self, *args, **options):
+        search.rebuild_index()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
@@ -0,0 +1,125 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from apps.blog import search
+from apps.blog.cache import bump_version
+from apps.blog.counters import rebuild_counters
+from apps.blog.models import Author, Category, Post
+from apps.blog.slugs import allocate_slugs
+
+User = get_user_model()
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim"
+).split()
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds users, authors, categories and posts for benchmarks, "
+        "e.g. --posts 1000, 100000 or 1000000."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--posts", type=int, default=1000)
+        parser.add_argument("--authors", type=int, default=50)
+        parser.add_argument("--categories", type=int, default=20)
+        parser.add_argument(
+            "--body-size",
+            type=int,
+            default=1000,
+            help="Approximate number of characters of each post body.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+
+        password = make_password(None)
+        author_ids = []
+        for offset in range(0, options["authors"], batch_size):
+            end = min(offset + batch_size, options["authors"])
+            emails = [
+                f"seed{index}@example.com" for index in range(offset, end)
+            ]
+            User.objects.bulk_create(
+                [
+                    User(email=email, password=password, is_active=True)
+                    for email in emails
+                ],
+                ignore_conflicts=True,
+            )
+            user_ids = list(
+                User.objects.filter(email__in=emails).values_list(
+                    "pk", flat=True
+                )
+            )
+            # bulk_create skips the signal creating authors
+            Author.objects.bulk_create(
+                [Author(user_id=user_id) for user_id in user_ids],
+                ignore_conflicts=True,
+            )
+            author_ids.extend(user_ids)
+
+        Category.objects.bulk_create(
+            Category(title=f"Category {index}")
+            for index in range(options["categories"])
+        )
+        category_ids = list(Category.objects.values_list("pk", flat=True))
+
+        now = timezone.now()
+        for offset in range(0, options["posts"], batch_size):
+            count = min(batch_size, options["posts"] - offset)
+            posts = []
+            for _ in range(count):
+                title = " ".join(rng.choices(WORDS, k=6)).capitalize()
+                body = self.get_body(rng, options["body_size"])
+                posts.append(
+                    Post(
+                        title=title,
+                        body=body,
+                        status=rng.choice(
+                            [Post.STATUS_PUBLISHED] * 9 + [Post.STATUS_DRAFT]
+                        ),
+                        category_id=rng.choice(category_ids),
+                        author_id=rng.choice(author_ids),
+                    )
+                )
+            slugs = allocate_slugs(post.title for post in posts)
+            for post, slug in zip(posts, slugs):
+                post.slug = slug
+            with transaction.atomic():
+                created = Post.objects.bulk_create(posts)
+                # auto_now_add ignores given values, spread them out
+                for post in created:
+                    post.created_at = now - timedelta(
+                        minutes=rng.randrange(525600)
+                    )
+                Post.objects.bulk_update(created, ["created_at"])
+            self.stdout.write(f"{offset + count} posts created")
+
+        search.rebuild_index()
+        # bulk_create skips the post counters
+        for model in [Category, Author]:
+            for _ in rebuild_counters(model):
+                pass
+        bump_version(Post, Category, Author)
+        self.stdout.write(self.style.SUCCESS("Seeding finished."))
+
+    def get_body(self, rng, size):
+        words = []
+        length = 0
+        while length < size:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("status", "pub")),
+                fields=["-created_at", "-id"],
+                name="post_published_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                condition=models.Q(("is_active", True), ("status", "pub")),
+                fields=["category", "-created_at", "-id"],
+                name="post_published_category_idx",
+            ),
+        ),
+    ]
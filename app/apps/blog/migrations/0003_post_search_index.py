@@ -0,0 +1,48 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+
+def get_search_index():
+    # Must stay identical to apps.blog.search.postgres.get_search_vector
+    return GinIndex(
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("body", weight="B", config="english"),
+        name="post_search_idx",
+        condition=models.Q(is_active=True),
+    )
+
+
+def create_search_index(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.add_index(Post, get_search_index())
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE blog_post_search "
+            "USING fts5(title, body, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO blog_post_search (rowid, title, body) "
+            "SELECT id, title, body FROM blog_post WHERE is_active"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.remove_index(Post, get_search_index())
+    elif vendor == "sqlite":
+        schema_editor.execute("DROP TABLE blog_post_search")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0002_post_published_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:23
+
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    """
+    Reserves every existing slug. New slugs are allocated as base or
+    base--N and existing slugs contain no "--", so they cannot collide.
+    """
+    Post = apps.get_model("blog", "Post")
+    SlugCounter = apps.get_model("blog", "SlugCounter")
+    slugs = Post.objects.values_list("slug", flat=True).iterator()
+    SlugCounter.objects.bulk_create(
+        (SlugCounter(base=slug, count=1) for slug in slugs), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0003_post_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlugCounter",
+            fields=[
+                (
+                    "base",
+                    models.CharField(
+                        max_length=50, primary_key=True, serialize=False
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english'::regconfig, "
+    "COALESCE(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, "
+    "COALESCE(body, '')), 'B')"
+)
+
+
+def get_expression_index():
+    # The index of migration 0003
+    return GinIndex(
+        SearchVector("title", weight="A", config="english")
+        + SearchVector("body", weight="B", config="english"),
+        name="post_search_idx",
+        condition=models.Q(is_active=True),
+    )
+
+
+def add_search_vector(apps, schema_editor):
+    """
+    Replaces the expression index with a stored generated column, so
+    ranking reads each tsvector instead of computing it for every match.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Post = apps.get_model("blog", "Post")
+    schema_editor.remove_index(Post, get_expression_index())
+    schema_editor.execute(
+        "ALTER TABLE blog_post ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    schema_editor.execute(
+        "CREATE INDEX post_search_idx ON blog_post "
+        "USING gin (search_vector) WHERE is_active"
+    )
+
+
+def remove_search_vector(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Post = apps.get_model("blog", "Post")
+    schema_editor.execute("DROP INDEX post_search_idx")
+    schema_editor.execute("ALTER TABLE blog_post DROP COLUMN search_vector")
+    schema_editor.add_index(Post, get_expression_index())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0004_slug_counter"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_vector, remove_search_vector),
+    ]
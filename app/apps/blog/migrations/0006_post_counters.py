@@ -0,0 +1,65 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:43
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_posts(apps, schema_editor):
+    """
+    Fills the counters of existing categories and authors.
+    """
+    Post = apps.get_model("blog", "Post")
+    published = models.Q(is_active=True, status="pub")
+    for model_name, field in [("Category", "category"), ("Author", "author")]:
+        model = apps.get_model("blog", model_name)
+        posts = (
+            Post.objects.filter(**{field: models.OuterRef("pk")})
+            .order_by()
+            .values(field)
+        )
+        model.objects.update(
+            posts_count=Coalesce(
+                models.Subquery(
+                    posts.annotate(count=models.Count("pk")).values("count")
+                ),
+                0,
+            ),
+            published_posts_count=Coalesce(
+                models.Subquery(
+                    posts.filter(published)
+                    .annotate(count=models.Count("pk"))
+                    .values("count")
+                ),
+                0,
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0005_post_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="author",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="author",
+            name="published_posts_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="posts_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="published_posts_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:47
+
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def get_prefix_indexes():
+    # PostgreSQL runs istartswith as UPPER(column::text) LIKE 'PREFIX%',
+    # which needs a pattern operator class under any collation but C
+    return [
+        (
+            "Post",
+            models.Index(
+                OpClass(Upper("title"), name="text_pattern_ops"),
+                name="post_title_upper_idx",
+            ),
+        ),
+        (
+            "Category",
+            models.Index(
+                OpClass(Upper("title"), name="text_pattern_ops"),
+                name="category_title_upper_idx",
+            ),
+        ),
+        (
+            "Author",
+            models.Index(
+                OpClass(Upper("last_name"), name="text_pattern_ops"),
+                name="author_last_name_upper_idx",
+            ),
+        ),
+    ]
+
+
+def create_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in get_prefix_indexes():
+        schema_editor.add_index(apps.get_model("blog", model_name), index)
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for model_name, index in get_prefix_indexes():
+        schema_editor.remove_index(apps.get_model("blog", model_name), index)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0006_post_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="post",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="post_created_idx"
+            ),
+        ),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,52 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import migrations, models
+from django.db.models.functions import Upper
+
+
+def get_prefix_index():
+    # The index of migration 0007
+    return models.Index(
+        OpClass(Upper("title"), name="text_pattern_ops"),
+        name="post_title_upper_idx",
+    )
+
+
+def get_trigram_index():
+    # PostgreSQL runs icontains as UPPER(column::text) LIKE '%TERM%',
+    # which trigrams of the same expression can answer
+    return GinIndex(
+        OpClass(Upper("title"), name="gin_trgm_ops"),
+        name="post_title_trgm_idx",
+    )
+
+
+def create_trigram_index(apps, schema_editor):
+    """
+    Replaces the title prefix index with a trigram index, the admin
+    searches titles by substring again. Like TrigramExtension, but left
+    installed on the way back and skipped on other databases both ways.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    Post = apps.get_model("blog", "Post")
+    schema_editor.add_index(Post, get_trigram_index())
+    schema_editor.remove_index(Post, get_prefix_index())
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Post = apps.get_model("blog", "Post")
+    schema_editor.add_index(Post, get_prefix_index())
+    schema_editor.remove_index(Post, get_trigram_index())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("blog", "0007_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -1,10 +1,38 @@
 from django.conf import settings
-from django.db import models
-from django.utils.text import slugify
+from django.db import models, router, transaction
 from django.utils.translation import gettext_lazy as _
 
+from core.db.routers import get_replica
 
-class Author(models.Model):
+
+class PostCountersMixin:
+    """
+    Leaves the post counters out of updates by save(), so that editing a
+    row never writes back counts that apps.blog.counters changed since
+    it was loaded. Only update_fields naming them write them.
+    """
+
+    counter_fields = ["posts_count", "published_posts_count"]
+
+    def save(self, *args, **kwargs):
+        if (
+            not args
+            and not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.attname
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.counter_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Author(PostCountersMixin, models.Model):
     first_name = models.CharField(max_length=150, blank=True)
     last_name = models.CharField(max_length=150, blank=True)
     user = models.OneToOneField(
@@ -14,14 +42,26 @@ class Author(models.Model):
         related_name="author",
     )
 
+    # Maintained by apps.blog.counters
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    published_posts_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+
     def __str__(self):
         return str(self.user.email)
 
 
-class Category(models.Model):
+class Category(PostCountersMixin, models.Model):
     title = models.CharField(max_length=100)
     description = models.CharField(max_length=500, blank=True)
 
+    # Maintained by apps.blog.counters
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+    published_posts_count = models.PositiveIntegerField(
+        default=0, editable=False
+    )
+
     class Meta:
         verbose_name_plural = "categories"
 
@@ -29,13 +69,28 @@ class Category(models.Model):
         return self.title
 
 
+class SlugCounter(models.Model):
+    """
+    Number of slugs handed out per base slug, see apps.blog.slugs.
+    """
+
+    base = models.CharField(max_length=50, primary_key=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.base
+
+
 class PublishedPostManager(models.Manager):
     def get_queryset(self):
-        return (
-            super()
-            .get_queryset()
-            .filter(is_active=True, status=Post.STATUS_PUBLISHED)
+        # Published posts may lag behind on a replica even outside
+        # requests, one picked per queryset, see core.db.routers
+        queryset = self._queryset_class(
+            model=self.model,
+            using=self._db,
+            hints={**self._hints, "replica": get_replica()},
         )
+        return queryset.filter(is_active=True, status=Post.STATUS_PUBLISHED)
 
 
 class Post(models.Model):
@@ -72,13 +127,54 @@ class Post(models.Model):
     objects = models.Manager()
     published = PublishedPostManager()
 
+    class Meta:
+        indexes = [
+            # Admin changelist order
+            models.Index(
+                fields=["-created_at", "-id"], name="post_created_idx"
+            ),
+            # Access paths of PublishedPostManager ordered by -created_at
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="post_published_created_idx",
+                condition=models.Q(is_active=True, status="pub"),
+            ),
+            models.Index(
+                fields=["category", "-created_at", "-id"],
+                name="post_published_category_idx",
+                condition=models.Q(is_active=True, status="pub"),
+            ),
+        ]
+
     def __str__(self):
         return self.title
 
     def save(self, *args, **kwargs):
+        from .counters import (
+            COUNTED_FIELDS,
+            get_state,
+            get_states,
+            update_counters,
+        )
+        from .slugs import allocate_slug
+
         if not self.id:
-            self.slug = slugify(self.title)
-        return super(Post, self).save(*args, **kwargs)
+            self.slug = allocate_slug(self.title, using=kwargs.get("using"))
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and not COUNTED_FIELDS.intersection(
+            update_fields
+        ):
+            return super(Post, self).save(*args, **kwargs)
+
+        using = kwargs.get("using") or router.db_for_write(Post, instance=self)
+        with transaction.atomic(using=using):
+            previous = {}
+            if self.id:
+                previous = get_states(
+                    Post.objects.using(using).filter(pk=self.id)
+                )
+            super(Post, self).save(*args, **kwargs)
+            update_counters(previous, {self.id: get_state(self)}, using)
 
     def delete(self):
         self.is_active = False
@@ -0,0 +1,56 @@
+import re
+
+from django.db import connections, router
+
+from ..models import Post
+from . import basic, postgres, sqlite
+
+BACKENDS = {"postgresql": postgres, "sqlite": sqlite}
+
+# Longer queries are cut down to keep MATCH expressions cheap
+MAX_TERMS = 8
+
+
+def get_backend(using=None):
+    """
+    Returns the search backend module for the database holding posts.
+    """
+    vendor = connections[using or router.db_for_write(Post)].vendor
+    return BACKENDS.get(vendor, basic)
+
+
+def parse_terms(query):
+    return re.findall(r"\w+", query.lower())[:MAX_TERMS]
+
+
+def search(queryset, query):
+    """
+    Filters queryset down to posts matching every term of query (each term
+    also matches as a prefix), ordered by relevance and annotated with
+    search_rank and search_highlight.
+    """
+    terms = parse_terms(query)
+    if not terms:
+        return queryset.none()
+    return get_backend(queryset.db).search(queryset, terms)
+
+
+def update_index(*posts):
+    """
+    Indexes active posts and drops inactive ones from the index.
+    """
+    backend = get_backend()
+    active = [post for post in posts if post.is_active]
+    if active:
+        backend.update(active)
+    inactive = [post.pk for post in posts if not post.is_active]
+    if inactive:
+        backend.remove(inactive)
+
+
+def remove_from_index(pks):
+    get_backend().remove(pks)
+
+
+def rebuild_index():
+    get_backend().rebuild()
@@ -0,0 +1,28 @@
+"""
+Unindexed fallback for databases without a full-text engine.
+"""
+from django.db.models import FloatField, Q, Value
+from django.db.models.functions import Substr
+
+
+def search(queryset, terms):
+    for term in terms:
+        queryset = queryset.filter(
+            Q(title__icontains=term) | Q(body__icontains=term)
+        )
+    return queryset.annotate(
+        search_rank=Value(0.0, output_field=FloatField()),
+        search_highlight=Substr("body", 1, 200),
+    )
+
+
+def update(posts):
+    pass
+
+
+def remove(pks):
+    pass
+
+
+def rebuild():
+    pass
@@ -0,0 +1,63 @@
+"""
+PostgreSQL backend built on a stored generated tsvector column over the
+weighted title and body, with a GIN index. PostgreSQL maintains both on
+every write, so update() and remove() have nothing to do.
+"""
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVectorField,
+)
+from django.db.models.expressions import RawSQL
+
+from ..models import Post
+
+SEARCH_CONFIG = "english"
+
+
+def get_search_vector():
+    # The column is added by migration 0005 and unknown to the model.
+    # Ranking reads it instead of rebuilding the tsvector of every match.
+    return RawSQL(
+        f'"{Post._meta.db_table}"."search_vector"',
+        [],
+        output_field=SearchVectorField(),
+    )
+
+
+def search(queryset, terms):
+    query = SearchQuery(
+        " & ".join(f"{term}:*" for term in terms),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+    return (
+        queryset.annotate(search_document=get_search_vector())
+        .filter(search_document=query)
+        .annotate(
+            search_rank=SearchRank(get_search_vector(), query),
+            search_highlight=SearchHeadline(
+                "body",
+                query,
+                config=SEARCH_CONFIG,
+                start_sel="<mark>",
+                stop_sel="</mark>",
+                max_words=35,
+                min_words=15,
+            ),
+        )
+        .order_by("-search_rank", "-created_at")
+    )
+
+
+def update(posts):
+    pass
+
+
+def remove(pks):
+    pass
+
+
+def rebuild():
+    pass
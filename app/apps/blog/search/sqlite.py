@@ -0,0 +1,82 @@
+"""
+SQLite backend built on an FTS5 table whose rowids are post ids.
+Rows are written by the post signals, since SQLite cannot index
+expressions for full-text search.
+"""
+from django.db import connections, router
+
+from ..models import Post
+
+TABLE = "blog_post_search"
+BATCH_SIZE = 500
+
+
+def get_connection():
+    return connections[router.db_for_write(Post)]
+
+
+def search(queryset, terms):
+    match = " ".join(f'"{term}"*' for term in terms)
+    # Joined rather than filtered through a subquery, so that bm25() and
+    # snippet() run once per match within the same full-text scan
+    return queryset.extra(
+        tables=[TABLE],
+        where=[
+            f'{TABLE}.rowid = "{Post._meta.db_table}"."id"',
+            f"{TABLE} MATCH %s",
+        ],
+        params=[match],
+        select={
+            # bm25() is lower for better matches, title weighs ten times
+            "search_rank": f"-bm25({TABLE}, 10.0, 1.0)",
+            "search_highlight": (
+                f"snippet({TABLE}, 1, '<mark>', '</mark>', '…', 24)"
+            ),
+        },
+    ).order_by("-search_rank", "-created_at")
+
+
+def update(posts):
+    """
+    Reindexes posts from their saved rows, so bulk writes need no more
+    than one statement per batch.
+    """
+    pks = [post.pk for post in posts]
+    remove(pks)
+    table = Post._meta.db_table
+    with get_connection().cursor() as cursor:
+        for batch in get_batches(pks):
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, title, body) "
+                f"SELECT id, title, body FROM {table} "
+                f"WHERE id IN ({placeholders})",
+                batch,
+            )
+
+
+def remove(pks):
+    pks = list(pks)
+    with get_connection().cursor() as cursor:
+        for batch in get_batches(pks):
+            placeholders = ", ".join(["%s"] * len(batch))
+            cursor.execute(
+                f"DELETE FROM {TABLE} WHERE rowid IN ({placeholders})", batch
+            )
+
+
+def get_batches(pks):
+    # Older SQLite builds allow 999 parameters per statement
+    for start in range(0, len(pks), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        yield pks[start:end]
+
+
+def rebuild():
+    table = Post._meta.db_table
+    with get_connection().cursor() as cursor:
+        cursor.execute(f"DELETE FROM {TABLE}")
+        cursor.execute(
+            f"INSERT INTO {TABLE} (rowid, title, body) "
+            f"SELECT id, title, body FROM {table} WHERE is_active"
+        )
@@ -1,8 +1,14 @@
+from functools import partial
+
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from ..models import Author
+from .. import autocomplete, search
+from ..cache import bump_version
+from ..counters import get_state, update_counters
+from ..models import Author, Category, Post
 
 User = get_user_model()
 
@@ -11,3 +17,54 @@ User = get_user_model()
 def create_author(sender, instance, created, **kwargs):
     if created:
         Author.objects.create(user=instance)
+
+
+@receiver(signal=post_save, sender=Post)
+@receiver(signal=post_save, sender=Category)
+@receiver(signal=post_save, sender=Author)
+@receiver(signal=post_delete, sender=Post)
+@receiver(signal=post_delete, sender=Category)
+@receiver(signal=post_delete, sender=Author)
+def invalidate_cached_responses(sender, using, **kwargs):
+    bump_version(sender, using=using)
+
+
+@receiver(signal=post_save, sender=Post)
+def update_search_index(sender, instance, **kwargs):
+    search.update_index(instance)
+
+
+@receiver(signal=post_delete, sender=Post)
+def remove_from_search_index(sender, instance, **kwargs):
+    search.remove_from_index([instance.pk])
+
+
+@receiver(signal=post_delete, sender=Post)
+def update_post_counters(sender, instance, using, **kwargs):
+    # Post.delete() only deactivates, this runs for queryset deletes
+    update_counters({instance.pk: get_state(instance)}, {}, using)
+
+
+@receiver(signal=post_save, sender=Category)
+@receiver(signal=post_save, sender=Author)
+@receiver(signal=post_delete, sender=Category)
+@receiver(signal=post_delete, sender=Author)
+def update_autocomplete_index(sender, instance, using, **kwargs):
+    # Applied after the version bump, once the row is committed
+    transaction.on_commit(
+        partial(autocomplete.update_index, sender, instance.pk), using=using
+    )
+
+
+@receiver(signal=post_save, sender=User)
+def update_author_email(
+    sender, instance, created, update_fields, using, **kwargs
+):
+    # New users get their author from create_author, logins only save
+    # last_login
+    if created or update_fields == {"last_login"}:
+        return
+    bump_version(Author, using=using)
+    transaction.on_commit(
+        partial(autocomplete.update_index, Author, instance.pk), using=using
+    )
@@ -0,0 +1,67 @@
+from collections import Counter
+
+from django.db import connections, router
+from django.utils.text import slugify
+
+from .models import Post, SlugCounter
+
+# slugify() collapses runs of dashes, so no base slug contains the
+# separator and base--2 can never be the base slug of another title
+SEPARATOR = "--"
+# Room left in Post.slug for the separator and a six digit number
+BASE_LENGTH = Post._meta.get_field("slug").max_length - 8
+# Counters reserved per statement, two parameters each
+BATCH_SIZE = 400
+
+
+def get_base_slug(title):
+    return slugify(title)[:BASE_LENGTH].strip("-") or "post"
+
+
+def allocate_slug(title, using=None):
+    return allocate_slugs([title], using=using)[0]
+
+
+def allocate_slugs(titles, using=None):
+    """
+    Returns a unique slug for each title: its base slug the first time,
+    then base--2, base--3, ... The numbers come from one atomic upsert of
+    SlugCounter per batch of distinct bases, so concurrent allocators get
+    distinct numbers without locking Post or retrying on IntegrityError.
+    """
+    bases = [get_base_slug(title) for title in titles]
+    counts = reserve(Counter(bases), using)
+
+    slugs = []
+    for base in reversed(bases):
+        number = counts[base]
+        counts[base] -= 1
+        slugs.append(base if number == 1 else f"{base}{SEPARATOR}{number}")
+    slugs.reverse()
+    return slugs
+
+
+def reserve(counts, using=None):
+    """
+    Adds counts to the counters of their bases and returns the new
+    totals, i.e. the last number reserved for each base.
+    """
+    connection = connections[using or router.db_for_write(SlugCounter)]
+    table = connection.ops.quote_name(SlugCounter._meta.db_table)
+    items = list(counts.items())
+    totals = {}
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), BATCH_SIZE):
+            end = start + BATCH_SIZE
+            batch = items[start:end]
+            values = ", ".join(["(%s, %s)"] * len(batch))
+            # Supported by PostgreSQL and SQLite 3.35+
+            cursor.execute(
+                f"INSERT INTO {table} (base, count) VALUES {values} "
+                f"ON CONFLICT (base) DO UPDATE "
+                f"SET count = {table}.count + excluded.count "
+                f"RETURNING base, count",
+                [value for item in batch for value in item],
+            )
+            totals.update(cursor.fetchall())
+    return totals
@@ -0,0 +1,13 @@
+from apps.jobs.queue import task
+
+from .counters import update_posts
+from .models import Post
+
+
+@task
+def update_posts_status(pks, status):
+    """
+    Sets the status of one chunk of posts queued by the admin actions. A
+    retried chunk is set again, chunks done by earlier jobs are kept.
+    """
+    update_posts(Post.objects.filter(pk__in=pks), status=status)
@@ -0,0 +1,70 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from apps.accounts.api.tokens import RefreshToken
+from apps.accounts.cache import user_states
+from apps.blog.models import Category, Post
+
+PASSWORD = "Test-Pass-1"
+
+
+@pytest.fixture(autouse=True)
+def clear_caches(settings):
+    """
+    Starts every test from cold caches, without in-process job workers.
+    """
+    settings.JOBS_RUN_IN_PROCESS = False
+    cache.clear()
+    user_states.clear()
+    yield
+    cache.clear()
+    user_states.clear()
+
+
+@pytest.fixture
+def user(db):
+    return get_user_model().objects.create_user(
+        email="author@example.com", password=PASSWORD, is_active=True
+    )
+
+
+@pytest.fixture
+def category(db):
+    return Category.objects.create(title="News", description="Daily news")
+
+
+@pytest.fixture
+def posts(user, category):
+    return [
+        Post.objects.create(
+            title=f"Post {number}",
+            body=f"Body of post {number}",
+            status=Post.STATUS_PUBLISHED,
+            category=category,
+            author_id=user.pk,
+        )
+        for number in range(5)
+    ]
+
+
+@pytest.fixture
+def post(posts):
+    return posts[0]
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def author_client(user):
+    """
+    Client sending a bearer token of user, like the API clients do.
+    """
+    client = APIClient()
+    token = RefreshToken.for_user(user).access_token
+    client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    return client
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.urls import reverse
+
+from apps.blog.counters import update_posts_in_chunks
+from apps.blog.models import Category, Post
+from apps.blog.tasks import update_posts_status
+from apps.jobs import queue
+from apps.jobs.models import Job
+
+# Each chunk has to commit for other connections to see it
+pytestmark = pytest.mark.django_db(transaction=True)
+
+CHUNK_SIZE = 2
+
+
+def run_concurrently(function):
+    """
+    Runs function on a connection of its own, like a concurrent request,
+    and returns its result. Fails when it waits on the locks of the
+    update; SQLite raises instead of waiting.
+    """
+    result = {}
+
+    def target():
+        try:
+            result["value"] = function()
+        except Exception as exc:
+            result["error"] = exc
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join(timeout=10)
+    assert not thread.is_alive(), "blocked by the chunked update"
+    if "error" in result:
+        raise result["error"]
+    return result["value"]
+
+
+def get_statuses(posts):
+    return list(
+        Post.objects.filter(pk__in=[post.pk for post in posts])
+        .order_by("pk")
+        .values_list("status", flat=True)
+    )
+
+
+def test_chunked_update_commits_per_chunk(posts, category):
+    chunks = update_posts_in_chunks(
+        Post.objects.all(), CHUNK_SIZE, status=Post.STATUS_DRAFT
+    )
+    done = 0
+    for updated in chunks:
+        done += updated
+        # Between chunks no transaction, and so no lock, is left open
+        assert not connection.in_atomic_block
+
+        statuses = run_concurrently(lambda: get_statuses(posts))
+        assert statuses == (
+            [Post.STATUS_DRAFT] * done
+            + [Post.STATUS_PUBLISHED] * (len(posts) - done)
+        )
+        # The counters commit along with their chunk
+        published_count = run_concurrently(
+            lambda: Category.objects.get(pk=category.pk).published_posts_count
+        )
+        assert published_count == len(posts) - done
+
+    assert done == len(posts)
+
+
+def test_chunked_update_lets_writers_in(posts):
+    last = posts[-1]
+    chunks = update_posts_in_chunks(
+        Post.objects.all(), CHUNK_SIZE, status=Post.STATUS_DRAFT
+    )
+    for number, _ in enumerate(chunks, 1):
+        # An admin edit of a post the update has yet to reach
+        title = f"Edited while chunk {number} is done"
+        run_concurrently(
+            lambda: Post.objects.filter(pk=last.pk).update(title=title)
+        )
+
+    last.refresh_from_db()
+    assert last.title == title
+    assert last.status == Post.STATUS_DRAFT
+
+
+def test_large_selection_queues_a_job_per_chunk(posts, client, settings):
+    settings.BLOG_ADMIN_ACTION_CHUNK_SIZE = CHUNK_SIZE
+    settings.BLOG_ADMIN_ACTION_MAX_SYNC = CHUNK_SIZE
+    admin = get_user_model().objects.create_superuser(
+        email="admin@example.com", password="Admin-Pass-1"
+    )
+    client.force_login(admin)
+
+    response = client.post(
+        reverse("admin:blog_post_changelist"),
+        {
+            "action": "set_as_draft",
+            "_selected_action": [post.pk for post in posts],
+        },
+    )
+
+    assert response.status_code == 302
+    name = f"{update_posts_status.__module__}.update_posts_status"
+    jobs = Job.objects.filter(name=name).order_by("pk")
+    assert [job.payload["pks"] for job in jobs] == [
+        [post.pk for post in posts[:2]],
+        [post.pk for post in posts[2:4]],
+        [post.pk for post in posts[4:]],
+    ]
+    assert get_statuses(posts) == [Post.STATUS_PUBLISHED] * len(posts)
+
+    # One job runs one chunk
+    assert queue.run_pending(limit=1) == 1
+    assert get_statuses(posts) == (
+        [Post.STATUS_DRAFT] * 2 + [Post.STATUS_PUBLISHED] * 3
+    )
+    queue.run_pending()
+    assert get_statuses(posts) == [Post.STATUS_DRAFT] * len(posts)
@@ -0,0 +1,72 @@
+import pytest
+from django.urls import reverse
+
+from apps.blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+
+def get_urls(post, category):
+    return [
+        reverse("blog_api_1.0:async:post-list"),
+        reverse("blog_api_1.0:async:post-detail", kwargs={"pk": post.pk}),
+        reverse("blog_api_1.0:async:category-list"),
+        reverse(
+            "blog_api_1.0:async:category-detail", kwargs={"pk": category.pk}
+        ),
+    ]
+
+
+@pytest.mark.parametrize("index", range(4))
+def test_sends_validators_and_answers_304(api_client, post, category, index):
+    url = get_urls(post, category)[index]
+
+    response = api_client.get(url)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert response.content == b""
+
+
+def test_post_validators_match_the_sync_endpoint(api_client, post):
+    """
+    Both endpoints hash the same row, only their paths differ.
+    """
+    kwargs = {"pk": post.pk}
+    sync = api_client.get(reverse("blog_api_1.0:post-detail", kwargs=kwargs))
+    response = api_client.get(
+        reverse("blog_api_1.0:async:post-detail", kwargs=kwargs)
+    )
+
+    assert response["Last-Modified"] == sync["Last-Modified"]
+    assert response.json() == sync.json()
+
+    response = api_client.get(
+        reverse("blog_api_1.0:async:post-detail", kwargs=kwargs),
+        HTTP_IF_MODIFIED_SINCE=sync["Last-Modified"],
+    )
+    assert response.status_code == 304
+
+
+@pytest.mark.django_db(transaction=True)
+def test_changed_post_is_sent_again(api_client, post, category):
+    url = get_urls(post, category)[1]
+    etag = api_client.get(url)["ETag"]
+
+    Post.objects.get(pk=post.pk).save()
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+def test_unknown_post_has_no_validators(api_client, post):
+    url = reverse("blog_api_1.0:async:post-detail", kwargs={"pk": 0})
+
+    response = api_client.get(url)
+
+    assert response.status_code == 404
+    assert "ETag" not in response
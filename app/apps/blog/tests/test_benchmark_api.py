@@ -0,0 +1,43 @@
+import os
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from apps.blog import benchmarks
+
+pytestmark = pytest.mark.django_db
+
+# Posts seeded for the run, e.g. 100000 or 1000000 along with a
+# BENCHMARK_BASELINE recorded at that scale
+POSTS = int(os.environ.get("BENCHMARK_POSTS", 1000))
+SAVE_BASELINE = bool(os.environ.get("BENCHMARK_SAVE_BASELINE"))
+# Latency only compares on the machine that recorded the baseline
+LATENCY = bool(os.environ.get("BENCHMARK_LATENCY"))
+# Two timed calls are enough when only queries and memory compare
+ITERATIONS = int(
+    os.environ.get(
+        "BENCHMARK_ITERATIONS", 20 if LATENCY or SAVE_BASELINE else 2
+    )
+)
+
+
+@pytest.fixture
+def seeded(db):
+    call_command("seed_blog", posts=POSTS, stdout=StringIO())
+
+
+def test_api_within_baseline(seeded, settings):
+    results = benchmarks.run(benchmarks.SCENARIOS, ITERATIONS)
+    if SAVE_BASELINE:
+        benchmarks.save_baseline(settings.BENCHMARK_BASELINE, results)
+        pytest.skip(f"Baseline saved to {settings.BENCHMARK_BASELINE}.")
+
+    failures = benchmarks.compare(
+        results,
+        benchmarks.load_baseline(settings.BENCHMARK_BASELINE),
+        benchmarks.TOLERANCE,
+        benchmarks.MIN_DELTA,
+        latency=LATENCY,
+    )
+    assert not failures, "\n".join(failures)
@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+
+from apps.blog import autocomplete
+from apps.blog.models import Category
+
+pytestmark = pytest.mark.django_db
+
+LIST_URL = reverse("blog_api_1.0:category-list")
+ASYNC_LIST_URL = reverse("blog_api_1.0:async:category-list")
+
+
+@pytest.fixture
+def categories(db):
+    titles = [f"Travel {number:02}" for number in range(12)]
+    return [
+        Category.objects.create(title=title)
+        for title in [*titles, "Tech", "News"]
+    ]
+
+
+@pytest.fixture
+def search_limits(monkeypatch):
+    limits = []
+    search = autocomplete.search
+
+    def record(model, prefix, limit=None):
+        limits.append(limit)
+        return search(model, prefix, limit)
+
+    monkeypatch.setattr(autocomplete, "search", record)
+    return limits
+
+
+def get_titles(response):
+    return [category["title"] for category in response.json()["results"]]
+
+
+def test_list_is_paginated(api_client, categories):
+    response = api_client.get(LIST_URL, {"page_size": 5})
+
+    assert response.status_code == 200
+    assert response.data["count"] == len(categories)
+    assert (
+        get_titles(response)
+        == sorted(category.title for category in categories)[:5]
+    )
+
+
+@pytest.mark.parametrize("url", [LIST_URL, ASYNC_LIST_URL])
+def test_prefix_looks_up_one_page(api_client, categories, search_limits, url):
+    first = api_client.get(url, {"prefix": "tr", "page_size": 5})
+    last = api_client.get(url, {"prefix": "tr", "page_size": 5, "page": 3})
+
+    titles = [f"Travel {number:02}" for number in range(12)]
+    assert get_titles(first) == titles[:5]
+    assert "count" not in first.json()
+    assert "page=2&" in first.json()["links"]["next"]
+    assert first.json()["links"]["previous"] is None
+    assert get_titles(last) == titles[10:]
+    assert last.json()["links"]["next"] is None
+    # The page, the pages before it and one more match, sync requests
+    # filter for their validators too
+    assert set(search_limits) == {6, 16}
+
+
+def test_prefix_without_match(api_client, categories):
+    response = api_client.get(LIST_URL, {"prefix": "xyz"})
+
+    assert response.status_code == 200
+    assert response.data["results"] == []
+
+
+def test_invalid_prefix_page(api_client, categories):
+    response = api_client.get(LIST_URL, {"prefix": "tr", "page": "last"})
+
+    assert response.status_code == 404
+
+
+def test_prefix_on_large_table_queries_the_database(
+    api_client, categories, search_limits, settings
+):
+    settings.BLOG_AUTOCOMPLETE_INDEX_MAX_ROWS = 5
+
+    response = api_client.get(LIST_URL, {"prefix": "t", "page_size": 5})
+
+    assert get_titles(response) == [
+        "Tech",
+        "Travel 00",
+        "Travel 01",
+        "Travel 02",
+        "Travel 03",
+    ]
+    assert "page=2&" in response.data["links"]["next"]
+    assert search_limits == []
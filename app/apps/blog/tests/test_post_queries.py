@@ -0,0 +1,156 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.accounts.api.tokens import RefreshToken
+from apps.blog.models import Post
+
+pytestmark = pytest.mark.django_db
+
+LIST_URL = reverse("blog_api_1.0:post-list")
+
+
+def detail_url(post):
+    return reverse("blog_api_1.0:post-detail", kwargs={"pk": post.pk})
+
+
+def post_data(category, **values):
+    return {
+        "title": "New post",
+        "body": "New body",
+        "status": Post.STATUS_PUBLISHED,
+        "category": category.pk,
+        **values,
+    }
+
+
+@pytest.mark.parametrize(
+    "params, queries",
+    [
+        # Validators, count and page
+        ({}, 3),
+        ({"page": 2, "page_size": 2}, 3),
+        # The category filter looks its choice up for either queryset
+        ({"category": True, "from_date": "2000-01-01T00:00:00Z"}, 5),
+        ({"ordering": "created_at"}, 3),
+        # Validators and one page past the cursor
+        ({"pagination": "cursor"}, 2),
+        ({"q": "body"}, 3),
+    ],
+)
+def test_list(
+    api_client, category, posts, params, queries, django_assert_num_queries
+):
+    if params.get("category"):
+        params = {**params, "category": category.pk}
+    with django_assert_num_queries(queries):
+        response = api_client.get(LIST_URL, params)
+    assert response.status_code == 200
+
+
+def test_list_does_not_grow_with_the_page(
+    api_client, user, category, posts, django_assert_num_queries
+):
+    for number in range(20):
+        Post.objects.create(
+            title=f"More {number}",
+            body="More",
+            status=Post.STATUS_PUBLISHED,
+            category=category,
+            author_id=user.pk,
+        )
+    with django_assert_num_queries(3):
+        response = api_client.get(LIST_URL, {"page_size": 25})
+    assert len(response.data["results"]) == 25
+
+
+def test_cached_list(api_client, posts, django_assert_num_queries):
+    api_client.get(LIST_URL)
+    with django_assert_num_queries(0):
+        response = api_client.get(LIST_URL)
+    assert response.status_code == 200
+
+
+def test_retrieve(api_client, post, django_assert_num_queries):
+    # Validators and the post with its category and author
+    with django_assert_num_queries(2):
+        response = api_client.get(detail_url(post))
+    assert response.status_code == 200
+
+
+def test_retrieve_unknown(api_client, posts, django_assert_num_queries):
+    with django_assert_num_queries(2):
+        response = api_client.get(detail_url(Post(pk=0)))
+    assert response.status_code == 404
+
+
+def test_create(author_client, category, django_assert_num_queries):
+    # User state, token version, category, slug, the post, its search
+    # row and the counters of its category and author
+    with django_assert_num_queries(11):
+        response = author_client.post(
+            LIST_URL, post_data(category), format="json"
+        )
+    assert response.status_code == 201
+
+
+def test_update(author_client, post, category, django_assert_num_queries):
+    with django_assert_num_queries(10):
+        response = author_client.put(
+            detail_url(post), post_data(category), format="json"
+        )
+    assert response.status_code == 200
+
+
+def test_partial_update(author_client, post, django_assert_num_queries):
+    # Uncounted fields leave the counters alone
+    with django_assert_num_queries(9):
+        response = author_client.patch(
+            detail_url(post), {"title": "Renamed"}, format="json"
+        )
+    assert response.status_code == 200
+
+
+def test_destroy(author_client, post, django_assert_num_queries):
+    # Deactivates the post, nothing loaded on demand
+    with django_assert_num_queries(10):
+        response = author_client.delete(detail_url(post))
+    assert response.status_code == 204
+
+
+def test_update_of_another_author(
+    api_client, post, category, django_assert_num_queries
+):
+    other = get_user_model().objects.create_user(
+        email="other@example.com", password="Other-Pass-1", is_active=True
+    )
+    token = RefreshToken.for_user(other).access_token
+    api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    # Refused before anything is written
+    with django_assert_num_queries(3):
+        response = api_client.patch(
+            detail_url(post), {"title": "Renamed"}, format="json"
+        )
+    assert response.status_code == 403
+
+
+def test_export(api_client, posts, django_assert_num_queries):
+    response = api_client.get(reverse("blog_api_1.0:post-export"))
+    # One query per BLOG_EXPORT_CHUNK_SIZE rows, run while streaming
+    with django_assert_num_queries(1):
+        rows = b"".join(response.streaming_content).splitlines()
+    assert len(rows) == len(posts)
+
+
+@pytest.mark.parametrize("count", [5, 50])
+def test_bulk(author_client, post, category, count, django_assert_num_queries):
+    items = [post_data(category, title=f"Bulk {n}") for n in range(count)]
+    items.append(post_data(category, pk=post.pk, title="Bulk update"))
+    # Whatever the number of items
+    with django_assert_num_queries(14):
+        response = author_client.post(
+            reverse("blog_api_1.0:post-bulk"), items, format="json"
+        )
+    assert response.status_code == 200
+    assert len(response.data["created"]) == count
+    assert response.data["updated"] == [post.pk]
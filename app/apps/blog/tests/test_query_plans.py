@@ -0,0 +1,17 @@
+import pytest
+
+from apps.blog.query_plans import get_cases, get_list_queryset, get_plan
+
+pytestmark = pytest.mark.django_db
+
+CASES = get_cases(category_id=0)
+
+
+@pytest.mark.parametrize(
+    "name, params, index", CASES, ids=[name for name, *_ in CASES]
+)
+def test_list_query_uses_index(category, posts, name, params, index):
+    if "category" in params:
+        params = {**params, "category": str(category.pk)}
+    plan = get_plan(get_list_queryset(params))
+    assert index in plan, plan
@@ -0,0 +1,91 @@
+import pytest
+from django.db.models import Value
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.blog.api.v1.serializers import (
+    CategoryReadSerializer,
+    CategorySerializer,
+    PostReadSerializer,
+    PostSerializer,
+)
+from apps.blog.api.v1.views import CategoryViewSet, PostViewSet
+from apps.blog.models import Category, Post
+
+pytestmark = pytest.mark.django_db
+
+
+def get_context(view_class, action, detail):
+    """
+    Builds the context a request of view_class for action would pass.
+    """
+    kwargs = {"pk": 1} if detail else {}
+    view = view_class(action_map={"get": action}, args=(), kwargs=kwargs)
+    view.action = action
+    request = view.initialize_request(APIRequestFactory().get("/"))
+    request.parser_context["kwargs"] = kwargs
+    return {"request": request, "view": view}
+
+
+def render(serializer_class, queryset, context):
+    data = serializer_class(queryset, many=True, context=context).data
+    return JSONRenderer().render(data)
+
+
+@pytest.fixture
+def mixed_posts(posts, user):
+    """
+    posts along with a draft in a category without description.
+    """
+    category = Category.objects.create(title="Misc", description="")
+    draft = Post.objects.create(
+        title="Draft",
+        body="",
+        status=Post.STATUS_DRAFT,
+        category=category,
+        author_id=user.pk,
+    )
+    return [*posts, draft]
+
+
+@pytest.mark.parametrize(
+    "action, detail",
+    [("list", False), ("retrieve", True), ("export", True)],
+)
+@pytest.mark.parametrize("highlight", [False, True])
+def test_post_read_serializer_matches(mixed_posts, action, detail, highlight):
+    queryset = Post.objects.order_by("-created_at")
+    if highlight:
+        queryset = queryset.annotate(search_highlight=Value("<b>Body</b>"))
+    context = get_context(PostViewSet, action, detail)
+
+    expected = render(
+        PostSerializer,
+        queryset.select_related("category", "author"),
+        context,
+    )
+    compiled = render(
+        PostReadSerializer,
+        PostReadSerializer.project(queryset, action),
+        context,
+    )
+
+    assert compiled == expected
+    assert (b'"highlight"' in compiled) is highlight
+
+
+@pytest.mark.parametrize(
+    "action, detail", [("list", False), ("retrieve", True)]
+)
+def test_category_read_serializer_matches(mixed_posts, action, detail):
+    queryset = Category.objects.order_by("title")
+    context = get_context(CategoryViewSet, action, detail)
+
+    expected = render(CategorySerializer, queryset, context)
+    compiled = render(
+        CategoryReadSerializer,
+        CategoryReadSerializer.project(queryset, action),
+        context,
+    )
+
+    assert compiled == expected
@@ -0,0 +1,103 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import DEFAULT_DB_ALIAS
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
+
+from apps.blog.models import Post
+from core.db.middleware import ReplicaMiddleware
+from core.db.routers import ReplicaRouter, use_replica
+
+REPLICAS = [f"replica_{number}" for number in range(1, 9)]
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = REPLICAS
+
+
+def read_aliases(count=20):
+    router = ReplicaRouter()
+    return {router.db_for_read(Post) for _ in range(count)}
+
+
+def get_request(pinned=False):
+    request = RequestFactory().get("/")
+    if pinned:
+        request.COOKIES[ReplicaMiddleware.cookie_name] = "1"
+    return request
+
+
+@pytest.mark.parametrize("pinned", [False, True])
+def test_request_reads_from_one_database(pinned):
+    seen = []
+
+    def get_response(request):
+        seen.append(read_aliases())
+        return StreamingHttpResponse([])
+
+    ReplicaMiddleware(get_response)(get_request(pinned))
+
+    [aliases] = seen
+    if pinned:
+        assert aliases == {None}
+    else:
+        assert len(aliases) == 1
+        assert aliases <= set(REPLICAS)
+
+
+@pytest.mark.parametrize("pinned", [False, True])
+def test_streamed_body_reads_from_the_request_database(pinned):
+    seen = []
+
+    def get_response(request):
+        seen.append(use_replica.get())
+
+        def stream():
+            for _ in range(3):
+                seen.append(use_replica.get())
+                yield b"part"
+
+        return StreamingHttpResponse(stream())
+
+    response = ReplicaMiddleware(get_response)(get_request(pinned))
+    assert use_replica.get() is None
+    b"".join(response.streaming_content)
+
+    assert len(seen) == 4
+    assert set(seen) == {DEFAULT_DB_ALIAS if pinned else seen[0]}
+    assert use_replica.get() is None
+
+
+def test_async_streamed_body_reads_from_the_request_database():
+    seen = []
+
+    async def get_response(request):
+        seen.append(use_replica.get())
+
+        async def stream():
+            for _ in range(3):
+                seen.append(use_replica.get())
+                yield b"part"
+
+        return StreamingHttpResponse(stream())
+
+    async def run():
+        middleware = ReplicaMiddleware(get_response)
+        response = await middleware(get_request(pinned=True))
+        return [part async for part in response.streaming_content]
+
+    assert async_to_sync(run)() == [b"part"] * 3
+    assert seen == [DEFAULT_DB_ALIAS] * 4
+
+
+def test_queryset_outside_requests_keeps_its_replica():
+    router = ReplicaRouter()
+    queryset = Post.published.all()
+    aliases = {
+        router.db_for_read(Post, **queryset.filter(pk=number)._hints)
+        for number in range(20)
+    }
+
+    assert len(aliases) == 1
+    assert aliases <= set(REPLICAS)
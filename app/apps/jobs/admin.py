@@ -0,0 +1,26 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from . import models
+
+
+@admin.register(models.Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["pk", "name", "status", "attempts", "run_at"]
+    list_display_links = ["pk", "name"]
+    list_filter = ["status", "name"]
+    list_per_page = 10
+    readonly_fields = ["payload", "created_at", "started_at", "finished_at"]
+    ordering = ["-pk"]
+    actions = ["retry"]
+
+    @admin.action(description="Retry")
+    def retry(self, request, queryset):
+        updated_counts = queryset.exclude(
+            status=models.Job.STATUS_RUNNING
+        ).update(
+            status=models.Job.STATUS_PENDING,
+            attempts=0,
+            run_at=timezone.now(),
+        )
+        self.message_user(request, message=f"{updated_counts} job(s) queued.")
@@ -0,0 +1,12 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.queue import get_metrics
+
+
+class Command(BaseCommand):
+    help = "Prints the job queue depth and latency as JSON."
+
+    def handle(self, *args, **options):
+        self.stdout.write(json.dumps(get_metrics(), indent=2))
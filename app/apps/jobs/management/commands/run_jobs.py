@@ -0,0 +1,27 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from apps.jobs.workers import WorkerPool
+
+
+class Command(BaseCommand):
+    help = "Runs queued jobs on a fixed pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int, help="Number of worker threads."
+        )
+
+    def handle(self, *args, **options):
+        pool = WorkerPool(workers=options["workers"])
+        stopped = threading.Event()
+        for signum in [signal.SIGINT, signal.SIGTERM]:
+            signal.signal(signum, lambda *args: stopped.set())
+
+        pool.start()
+        self.stdout.write(f"Running jobs on {pool.workers} worker(s).")
+        stopped.wait()
+        self.stdout.write("Waiting for running jobs to finish...")
+        pool.stop()
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="claimed_by",
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
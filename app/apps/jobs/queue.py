@@ -0,0 +1,189 @@
+import logging
+import traceback
+from datetime import timedelta
+from functools import partial
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Max
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, batch=False):
+    """
+    Registers func as a job handler. Call func.enqueue(**kwargs) to run
+    it later on a worker with the JSON-serializable kwargs.
+
+    A batch handler is called with the payloads of every job claimed
+    together and returns one error per payload, None on success.
+    """
+    if func is None:
+        return partial(task, batch=batch)
+
+    name = f"{func.__module__}.{func.__name__}"
+    func.batch = batch
+    registry[name] = func
+    func.enqueue = partial(enqueue, name)
+    return func
+
+
+def enqueue(name, **payload):
+    job = Job.objects.create(name=name, payload=payload)
+
+    if settings.JOBS_RUN_IN_PROCESS:
+        from .workers import get_pool
+
+        pool = get_pool()
+        transaction.on_commit(pool.wakeup.set)
+    return job
+
+
+def claim(limit=1):
+    """
+    Marks up to limit due jobs as running and returns them. The claim
+    token keeps concurrent workers from taking the same job.
+    """
+    now = timezone.now()
+    token = uuid4().hex
+    due = Job.objects.filter(
+        status=Job.STATUS_PENDING, run_at__lte=now
+    ).order_by("run_at", "pk")
+    Job.objects.filter(
+        pk__in=list(due.values_list("pk", flat=True)[:limit]),
+        status=Job.STATUS_PENDING,
+    ).update(
+        status=Job.STATUS_RUNNING,
+        attempts=F("attempts") + 1,
+        started_at=now,
+        claimed_by=token,
+    )
+    return list(
+        Job.objects.filter(
+            status=Job.STATUS_RUNNING, claimed_by=token
+        ).order_by("run_at", "pk")
+    )
+
+
+def run(jobs):
+    """
+    Runs claimed jobs, handing each batch task all of its jobs at once.
+    """
+    groups = {}
+    for job in jobs:
+        groups.setdefault(job.name, []).append(job)
+
+    for name, group in groups.items():
+        handler = registry.get(name)
+        if handler is None:
+            for job in group:
+                fail(job, f"No task registered as {name}.")
+        elif handler.batch:
+            try:
+                errors = handler([job.payload for job in group])
+            except Exception:
+                errors = [traceback.format_exc()] * len(group)
+            for job, error in zip(group, errors):
+                if error:
+                    fail(job, error)
+                else:
+                    complete(job)
+        else:
+            for job in group:
+                try:
+                    handler(**job.payload)
+                except Exception:
+                    fail(job, traceback.format_exc())
+                else:
+                    complete(job)
+
+
+def complete(job):
+    job.status = Job.STATUS_DONE
+    job.finished_at = timezone.now()
+    job.last_error = ""
+    job.save(update_fields=["status", "finished_at", "last_error"])
+
+
+def fail(job, error):
+    """
+    Schedules a retry with exponential backoff, or moves the job to the
+    dead state once it has used up its attempts.
+    """
+    job.last_error = error
+    job.finished_at = timezone.now()
+    if job.attempts >= job.max_attempts:
+        job.status = Job.STATUS_DEAD
+        logger.error("Job %s is dead after %d attempts", job, job.attempts)
+    else:
+        delay = min(
+            settings.JOBS_RETRY_BACKOFF * 2 ** (job.attempts - 1),
+            settings.JOBS_RETRY_BACKOFF_MAX,
+        )
+        job.status = Job.STATUS_PENDING
+        job.run_at = job.finished_at + timedelta(seconds=delay)
+        logger.warning("Job %s failed, retrying in %ds", job, delay)
+    job.save(update_fields=["status", "run_at", "finished_at", "last_error"])
+
+
+def run_pending(limit=None):
+    jobs = claim(limit or settings.JOBS_BATCH_SIZE)
+    run(jobs)
+    return len(jobs)
+
+
+def requeue_stale():
+    """
+    Puts back jobs left running by a worker that died mid-job.
+    """
+    lease = timedelta(seconds=settings.JOBS_LEASE_TIMEOUT)
+    return Job.objects.filter(
+        status=Job.STATUS_RUNNING, started_at__lt=timezone.now() - lease
+    ).update(status=Job.STATUS_PENDING)
+
+
+def purge_done():
+    """
+    Deletes up to JOBS_BATCH_SIZE jobs that finished more than
+    JOBS_KEEP_DONE seconds ago.
+    """
+    kept_since = timezone.now() - timedelta(seconds=settings.JOBS_KEEP_DONE)
+    pks = Job.objects.filter(
+        status=Job.STATUS_DONE, finished_at__lt=kept_since
+    ).values_list("pk", flat=True)
+    deleted, _ = Job.objects.filter(
+        pk__in=list(pks[: settings.JOBS_BATCH_SIZE])
+    ).delete()
+    return deleted
+
+
+def get_metrics(period=timedelta(hours=1)):
+    """
+    Returns the queue depth per status and the wait and run times in
+    seconds of the jobs finished within period.
+    """
+    depth = dict.fromkeys(dict(Job.STATUS_CHOICES), 0)
+    for row in Job.objects.values("status").annotate(count=Count("pk")):
+        depth[row["status"]] = row["count"]
+
+    wait = F("started_at") - F("created_at")
+    duration = F("finished_at") - F("started_at")
+    stats = Job.objects.filter(
+        status=Job.STATUS_DONE, finished_at__gte=timezone.now() - period
+    ).aggregate(
+        finished=Count("pk"),
+        wait_avg=Avg(wait),
+        wait_max=Max(wait),
+        run_avg=Avg(duration),
+        run_max=Max(duration),
+    )
+    latency = {"finished": stats.pop("finished")}
+    for name, value in stats.items():
+        latency[name] = value.total_seconds() if value else 0.0
+    return {"depth": depth, "latency": latency}
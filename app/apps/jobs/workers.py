@@ -0,0 +1,68 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class WorkerPool:
+    """
+    Fixed number of threads running jobs from the queue.
+    """
+
+    def __init__(self, workers=None, poll_interval=None):
+        self.workers = workers or settings.JOBS_WORKERS
+        self.poll_interval = poll_interval or settings.JOBS_POLL_INTERVAL
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.threads = []
+
+    def start(self):
+        for index in range(self.workers):
+            thread = threading.Thread(
+                target=self.work, name=f"jobs-worker-{index}", daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout=None):
+        self.stopping.set()
+        self.wakeup.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def work(self):
+        while not self.stopping.is_set():
+            try:
+                processed = queue.run_pending()
+                if not processed:
+                    queue.requeue_stale()
+                    queue.purge_done()
+            except Exception:
+                logger.exception("Job worker failed")
+                processed = 0
+            finally:
+                close_old_connections()
+
+            if not processed:
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+
+def get_pool():
+    """
+    Returns the in-process pool, starting it on first use.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = WorkerPool()
+            _pool.start()
+    return _pool
@@ -0,0 +1,81 @@
+"""
+Timing helpers shared by the benchmark commands and apps.blog.benchmarks.
+"""
+import statistics
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Timings(list):
+    """
+    Durations in seconds of the calls timed through measure() or
+    time(), reported in ms.
+    """
+
+    @contextmanager
+    def measure(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.append(time.perf_counter() - start)
+
+    def time(self, function, *args, **kwargs):
+        with self.measure():
+            return function(*args, **kwargs)
+
+    async def atime(self, awaitable):
+        with self.measure():
+            return await awaitable
+
+    @property
+    def total(self):
+        return sum(self)
+
+    def rate(self, elapsed=None):
+        """
+        Returns the calls per second, over elapsed seconds for calls
+        timed concurrently.
+        """
+        return len(self) / (self.total if elapsed is None else elapsed)
+
+    def percentile(self, percent):
+        if len(self) == 1:
+            return self[0] * 1000
+        quantiles = statistics.quantiles(self, n=100, method="inclusive")
+        return quantiles[percent - 1] * 1000
+
+    def describe(self, percents=(50, 95), digits=1):
+        return ", ".join(
+            f"p{percent} {self.percentile(percent):.{digits}f} ms"
+            for percent in percents
+        )
+
+
+def measure_memory(function, *args, **kwargs):
+    """
+    Calls function and returns its result and the peak memory it
+    allocated, in bytes. Tracing slows the call down, time it apart.
+    """
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        return result, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_threads(target, count):
+    """
+    Runs target in count threads at once and returns the seconds until
+    every one of them finished.
+    """
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
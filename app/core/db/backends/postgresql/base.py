@@ -0,0 +1,175 @@
+"""
+PostgreSQL backend that can hand out connections from a psycopg_pool
+ConnectionPool per process, like the pool option of Django 5.1.
+
+Enable it with OPTIONS["pool"], True or a dict of ConnectionPool
+arguments such as min_size and max_size. Every connection acquisition is
+timed, pooled or not, see get_metrics().
+"""
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.base.base import NO_DB_ALIAS
+from django.db.backends.postgresql import base
+
+
+class ConnectionMetrics:
+    """
+    Connection acquisitions of one alias in this process. With a pool,
+    most acquisitions reuse an open connection and opened stays low.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.acquired = 0
+        self.opened = 0
+        self.acquire_total = 0.0
+        self.acquire_max = 0.0
+
+    def record_acquired(self, seconds):
+        with self.lock:
+            self.acquired += 1
+            self.acquire_total += seconds
+            self.acquire_max = max(self.acquire_max, seconds)
+
+    def record_opened(self):
+        with self.lock:
+            self.opened += 1
+
+    def as_dict(self):
+        with self.lock:
+            return {
+                "acquired": self.acquired,
+                "opened": self.opened,
+                "acquire_ms_total": round(self.acquire_total * 1000, 3),
+                "acquire_ms_avg": round(
+                    self.acquire_total * 1000 / (self.acquired or 1), 3
+                ),
+                "acquire_ms_max": round(self.acquire_max * 1000, 3),
+            }
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Shared by the wrappers of every thread, keyed by alias
+    _connection_pools = {}
+    _connection_metrics = {}
+
+    @property
+    def pool(self):
+        pool_options = self.settings_dict["OPTIONS"].get("pool")
+        if self.alias == NO_DB_ALIAS or not pool_options:
+            return None
+        if self.alias not in self._connection_pools:
+            if self.settings_dict["CONN_MAX_AGE"] != 0:
+                raise ImproperlyConfigured(
+                    "Pooling doesn't support persistent connections, "
+                    "set CONN_MAX_AGE to 0."
+                )
+            if pool_options is True:
+                pool_options = {}
+            try:
+                from psycopg_pool import ConnectionPool
+            except ImportError as err:
+                raise ImproperlyConfigured(
+                    "Error loading psycopg_pool module.\n"
+                    "Did you install psycopg[pool]?"
+                ) from err
+
+            connect_kwargs = self.get_connection_params()
+            # Django sets the autocommit mode it wants after getconn()
+            connect_kwargs["autocommit"] = True
+            check = None
+            if self.settings_dict["CONN_HEALTH_CHECKS"]:
+                check = ConnectionPool.check_connection
+            pool = ConnectionPool(
+                kwargs=connect_kwargs,
+                # Opened on first use, not while Django starts
+                open=False,
+                configure=self.configure_pooled_connection,
+                check=check,
+                name=self.alias,
+                **pool_options,
+            )
+            # Threads racing here may build several pools, only the first
+            # one stored is ever opened
+            self._connection_pools.setdefault(self.alias, pool)
+        return self._connection_pools[self.alias]
+
+    @property
+    def metrics(self):
+        return self._connection_metrics.setdefault(
+            self.alias, ConnectionMetrics()
+        )
+
+    def close_pool(self):
+        pool = self._connection_pools.pop(self.alias, None)
+        if pool is not None:
+            pool.close()
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop("pool", None)
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        options = self.settings_dict["OPTIONS"]
+        try:
+            self.isolation_level = base.IsolationLevel(
+                options.get(
+                    "isolation_level", base.IsolationLevel.READ_COMMITTED
+                )
+            )
+        except ValueError:
+            raise ImproperlyConfigured(
+                f"Invalid transaction isolation level "
+                f"{options['isolation_level']} specified. Use one of the "
+                f"psycopg.IsolationLevel values."
+            )
+        pool.open()
+        connection = pool.getconn()
+        # Pooled connections may come back with another level
+        connection.isolation_level = self.isolation_level
+        return connection
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        self.metrics.record_acquired(time.perf_counter() - start)
+        if self.pool is None:
+            self.metrics.record_opened()
+
+    def configure_pooled_connection(self, connection):
+        """
+        Called by the pool for every connection it opens, from its own
+        worker threads.
+        """
+        self.metrics.record_opened()
+
+    def _close(self):
+        if self.connection is None or self.pool is None:
+            return super()._close()
+        with self.wrap_database_errors:
+            # The pool rolls back whatever the connection left open
+            self.connection._pool.putconn(self.connection)
+            self.connection = None
+
+
+def get_metrics(connections):
+    """
+    Returns the acquisition metrics of every database of this backend
+    and the statistics of its pool, if it has one.
+    """
+    metrics = {}
+    for alias in connections:
+        wrapper = connections[alias]
+        if not isinstance(wrapper, DatabaseWrapper):
+            continue
+        metrics[alias] = wrapper.metrics.as_dict()
+        pool = wrapper._connection_pools.get(alias)
+        if pool is not None:
+            metrics[alias]["pool"] = pool.get_stats()
+    return metrics
@@ -0,0 +1,112 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+from .routers import get_replica, use_replica
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaMiddleware:
+    """
+    Lets safe requests read from the replicas. Unsafe requests, and the
+    requests of a client that wrote in the last
+    DATABASE_REPLICA_STICKY_SECONDS, read from the primary so that
+    authors see their own changes despite replication lag.
+    """
+
+    sync_capable = True
+    async_capable = True
+    cookie_name = "db_primary"
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        alias = self.reads_from_replica(request)
+        token = use_replica.set(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        return self.process_response(request, response, alias)
+
+    async def __acall__(self, request):
+        alias = self.reads_from_replica(request)
+        token = use_replica.set(alias)
+        try:
+            response = await self.get_response(request)
+        finally:
+            use_replica.reset(token)
+        return self.process_response(request, response, alias)
+
+    def reads_from_replica(self, request):
+        """
+        Returns the alias every read of request goes to: one replica for
+        the whole request, or the primary.
+        """
+        if (
+            request.method in SAFE_METHODS
+            and self.cookie_name not in request.COOKIES
+        ):
+            return get_replica() or DEFAULT_DB_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def process_response(self, request, response, alias):
+        if response.streaming:
+            # Streamed bodies run their queries after the request returned
+            if response.is_async:
+                response.streaming_content = astream_with(
+                    alias, response.streaming_content
+                )
+            else:
+                response.streaming_content = stream_with(
+                    alias, response.streaming_content
+                )
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=settings.DATABASE_REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def stream_with(alias, content):
+    """
+    Yields the parts of content with use_replica set to alias while each
+    is produced. Servers may iterate from another context, so the value
+    is set and reset around every part.
+    """
+    parts = iter(content)
+    while True:
+        token = use_replica.set(alias)
+        try:
+            part = next(parts, None)
+        finally:
+            use_replica.reset(token)
+        if part is None:
+            return
+        yield part
+
+
+async def astream_with(alias, content):
+    """
+    stream_with() for asynchronous content.
+    """
+    parts = aiter(content)
+    while True:
+        token = use_replica.set(alias)
+        try:
+            part = await anext(parts, None)
+        finally:
+            use_replica.reset(token)
+        if part is None:
+            return
+        yield part
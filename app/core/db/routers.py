@@ -0,0 +1,52 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Set for every request by ReplicaMiddleware to the alias all its reads
+# go to: a replica picked once for the request, or DEFAULT_DB_ALIAS when
+# they must see the primary. None outside requests
+use_replica = ContextVar("use_replica", default=None)
+
+
+def get_replica():
+    """
+    Returns a random replica alias, or None without replicas. Callers
+    keep it for every query of a request or queryset, so that counts,
+    rows and validators come from the same snapshot.
+    """
+    if settings.DATABASE_REPLICAS:
+        return random.choice(settings.DATABASE_REPLICAS)
+    return None
+
+
+def is_pinned_to_primary():
+    return use_replica.get() == DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """
+    Sends the reads of safe requests to the replica picked for the
+    request, and outside requests the reads of querysets hinted with a
+    replica alias to that replica. Writes and every other read go to
+    the default database.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = use_replica.get()
+        if alias is None:
+            alias = hints.get("replica")
+        if alias in settings.DATABASE_REPLICAS:
+            return alias
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in settings.DATABASE_REPLICAS
@@ -0,0 +1,64 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of large tables, which would
+    otherwise run an exact COUNT(*) on every page view.
+
+    Tables PostgreSQL estimates at ADMIN_ESTIMATED_COUNT_THRESHOLD rows
+    or more are counted from the planner statistics when unfiltered, and
+    filtered counts are cached for ADMIN_COUNT_CACHE_TIMEOUT seconds.
+    Smaller tables, and other databases, are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not settings.ADMIN_ESTIMATED_COUNTS or not hasattr(
+            queryset, "query"
+        ):
+            return super().count
+
+        estimate = self.get_table_estimate(queryset)
+        if estimate is None or estimate < (
+            settings.ADMIN_ESTIMATED_COUNT_THRESHOLD
+        ):
+            return super().count
+        if not queryset.query.has_filters():
+            return estimate
+        return self.get_cached_count(queryset)
+
+    def get_table_estimate(self, queryset):
+        """
+        Returns the number of rows of the queryset's table in the
+        statistics of PostgreSQL, None without any.
+        """
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        # -1 until the table is first vacuumed or analyzed
+        if row is None or row[0] < 0:
+            return None
+        return int(row[0])
+
+    def get_cached_count(self, queryset):
+        sql = str(queryset.query).encode()
+        key = f"admin:count:{hashlib.md5(sql).hexdigest()}"
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, timeout=settings.ADMIN_COUNT_CACHE_TIMEOUT)
+        return count
@@ -49,7 +49,6 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "rest_framework",
     "django_filters",
     "drf_yasg",
@@ -57,6 +56,7 @@ INSTALLED_APPS = [
     "mail_templated",
     "apps.accounts",
     "apps.blog",
+    "apps.jobs",
 ]
 
 MIDDLEWARE = [
@@ -67,9 +67,13 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
 ]
 
+# Debug-only apps stay out of the imports of production workers
+if DEBUG:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.append("debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -101,6 +105,137 @@ DATABASES = {
     }
 }
 
+# Production runs on PostgreSQL, e.g. DB_ENGINE=postgresql DB_NAME=weblog
+if config("DB_ENGINE", default="sqlite3") == "postgresql":
+    # Pooled connections per worker process, 0 keeps one persistent
+    # connection per thread instead
+    DB_POOL_MAX_SIZE = config("DB_POOL_MAX_SIZE", cast=int, default=4)
+    DATABASES["default"] = {
+        "ENGINE": "core.db.backends.postgresql",
+        "NAME": config("DB_NAME"),
+        "USER": config("DB_USER", default=""),
+        "PASSWORD": config("DB_PASSWORD", default=""),
+        "HOST": config("DB_HOST", default=""),
+        "PORT": config("DB_PORT", default=""),
+        # Pooled connections go back to the pool after every request
+        "CONN_MAX_AGE": 0
+        if DB_POOL_MAX_SIZE
+        else config("DB_CONN_MAX_AGE", cast=int, default=60),
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {},
+    }
+    if DB_POOL_MAX_SIZE:
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", cast=int, default=1),
+            "max_size": DB_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection
+            "timeout": config("DB_POOL_TIMEOUT", cast=float, default=10),
+        }
+    # Operator classes of the prefix search indexes, imports psycopg
+    INSTALLED_APPS.append("django.contrib.postgres")
+
+# Read replicas of the default database: SQLite files, or PostgreSQL
+# hosts serving DB_REPLICA_NAME. Try them locally with a copy of the
+# primary, e.g. cp db.sqlite3 replica.sqlite3 and DB_REPLICAS=replica.sqlite3
+DB_REPLICAS = config(
+    "DB_REPLICAS",
+    cast=lambda v: [s.strip() for s in v.split(",") if s.strip()],
+    default="",
+)
+DATABASE_REPLICAS = []
+for number, replica in enumerate(DB_REPLICAS, 1):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "OPTIONS": {**DATABASES["default"].get("OPTIONS", {})},
+        # Tests read what they write
+        "TEST": {"MIRROR": "default"},
+    }
+    if DATABASES["default"]["ENGINE"].endswith("sqlite3"):
+        DATABASES[alias]["NAME"] = BASE_DIR / replica
+    else:
+        DATABASES[alias]["HOST"] = replica
+        DATABASES[alias]["NAME"] = config(
+            "DB_REPLICA_NAME", default=DATABASES["default"]["NAME"]
+        )
+    DATABASE_REPLICAS.append(alias)
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["core.db.routers.ReplicaRouter"]
+    MIDDLEWARE.insert(1, "core.db.middleware.ReplicaMiddleware")
+# Seconds a client reads from the primary after one of its writes
+DATABASE_REPLICA_STICKY_SECONDS = config(
+    "DATABASE_REPLICA_STICKY_SECONDS", cast=int, default=10
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    # Room for token versions and cached responses of every worker
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": 10000}
+
+# Seconds a cached blog API response lives before it is rebuilt
+BLOG_RESPONSE_CACHE_TIMEOUT = config(
+    "BLOG_RESPONSE_CACHE_TIMEOUT", cast=int, default=300
+)
+# Rows fetched and serialized at a time by the post export
+BLOG_EXPORT_CHUNK_SIZE = config(
+    "BLOG_EXPORT_CHUNK_SIZE", cast=int, default=500
+)
+# Posts accepted per bulk write request and rows written per statement
+BLOG_BULK_MAX_ITEMS = config("BLOG_BULK_MAX_ITEMS", cast=int, default=1000)
+BLOG_BULK_BATCH_SIZE = config("BLOG_BULK_BATCH_SIZE", cast=int, default=500)
+# Posts updated per transaction by the admin status actions, and the
+# selection size above which the actions run as background jobs
+BLOG_ADMIN_ACTION_CHUNK_SIZE = config(
+    "BLOG_ADMIN_ACTION_CHUNK_SIZE", cast=int, default=500
+)
+BLOG_ADMIN_ACTION_MAX_SYNC = config(
+    "BLOG_ADMIN_ACTION_MAX_SYNC", cast=int, default=5000
+)
+# Rows of a model above which its autocomplete lookups go to the database
+# instead of an index in the memory of every process
+BLOG_AUTOCOMPLETE_INDEX_MAX_ROWS = config(
+    "BLOG_AUTOCOMPLETE_INDEX_MAX_ROWS", cast=int, default=100000
+)
+
+
+# Results manage.py benchmark_api and the tests compare against, see
+# apps.blog.benchmarks
+BENCHMARK_BASELINE = config(
+    "BENCHMARK_BASELINE",
+    cast=Path,
+    default=str(BASE_DIR / "benchmarks" / "baseline.json"),
+)
+
+
+# Schema files written by manage.py generate_schema, see core.schema
+API_SCHEMA_DIR = BASE_DIR / "schema"
+# Seconds clients reuse the schema fetched without its version
+API_SCHEMA_CACHE_TIMEOUT = config(
+    "API_SCHEMA_CACHE_TIMEOUT", cast=int, default=3600
+)
+
+
+# Admin changelists of tables with at least ADMIN_ESTIMATED_COUNT_THRESHOLD
+# rows show estimated counts on PostgreSQL, see core.paginators
+ADMIN_ESTIMATED_COUNTS = config(
+    "ADMIN_ESTIMATED_COUNTS", cast=bool, default=True
+)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 10000
+# Seconds a filtered changelist count is reused
+ADMIN_COUNT_CACHE_TIMEOUT = 60
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -147,10 +282,12 @@ AUTH_USER_MODEL = "accounts.User"
 
 
 REST_FRAMEWORK = {
+    # Bearer tokens first so that they skip the other authenticators,
+    # Basic last since it runs the password hasher on every request.
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework.authentication.BasicAuthentication",
+        "apps.accounts.api.authentication.StatelessJWTAuthentication",
         "rest_framework.authentication.SessionAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
     )
 }
 
@@ -159,6 +296,19 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=8),
 }
 
+# User state cached per process for StatelessJWTAuthentication
+ACCOUNTS_USER_STATE_CACHE_SIZE = 10000
+ACCOUNTS_USER_STATE_CACHE_TTL = 60
+# Token versions outlive every token issued with them in a shared cache.
+# A cache of each process only keeps them for seconds, revocations in
+# one process reach the others once their copy expires.
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    ACCOUNTS_TOKEN_VERSION_TIMEOUT = 5
+else:
+    ACCOUNTS_TOKEN_VERSION_TIMEOUT = int(
+        SIMPLE_JWT["REFRESH_TOKEN_LIFETIME"].total_seconds()
+    )
+
 
 # Email Backend
 
@@ -166,3 +316,22 @@ EMAIL_BACKEND = config("EMAIL_BACKEND")
 EMAIL_HOST = config("EMAIL_HOST")
 EMAIL_PORT = config("EMAIL_PORT")
 EMAIL_USE_TLS = config("EMAIL_USE_TLS", cast=bool)
+
+
+# Background Jobs
+
+# Start a worker pool inside each web process on first enqueue.
+# Turn off when jobs run in a separate `manage.py run_jobs` process.
+JOBS_RUN_IN_PROCESS = config("JOBS_RUN_IN_PROCESS", cast=bool, default=True)
+JOBS_WORKERS = config("JOBS_WORKERS", cast=int, default=2)
+JOBS_POLL_INTERVAL = 5
+# Jobs a worker claims at once, batch tasks such as emails get them all
+JOBS_BATCH_SIZE = config("JOBS_BATCH_SIZE", cast=int, default=50)
+JOBS_MAX_ATTEMPTS = 5
+# Seconds before the first retry, doubled on every further attempt
+JOBS_RETRY_BACKOFF = 30
+JOBS_RETRY_BACKOFF_MAX = 3600
+# Seconds after which a running job is assumed lost and queued again
+JOBS_LEASE_TIMEOUT = 600
+# Seconds done jobs are kept before idle workers delete them
+JOBS_KEEP_DONE = config("JOBS_KEEP_DONE", cast=int, default=86400)
@@ -14,47 +14,32 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Weblog",
-        default_version="v1",
-        description="Weblog",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="erfan@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-    permission_classes=(permissions.AllowAny,),
+from core.views import (
+    DatabaseMetricsView,
+    lazy_schema_view,
+    schema_artifact_view,
 )
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("__debug__/", include("debug_toolbar.urls")),
     # *** Only for testing ***
     path("api-auth/", include("rest_framework.urls")),
-    path(
-        "swagger<format>/",
-        schema_view.without_ui(cache_timeout=0),
-        name="schema-json",
-    ),
-    path(
-        "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
-        name="schema-swagger-ui",
-    ),
-    path(
-        "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
-        name="schema-redoc",
-    ),
+    path("swagger<format>/", schema_artifact_view, name="schema-json"),
+    path("swagger/", lazy_schema_view("swagger"), name="schema-swagger-ui"),
+    path("redoc/", lazy_schema_view("redoc"), name="schema-redoc"),
     path("api-1.0/auth/", include("apps.accounts.api.v1.urls")),
     path("blog/", include("apps.blog.pages.urls")),
     path("api-1.0/blog/", include("apps.blog.api.v1.urls")),
+    path(
+        "api-1.0/metrics/db/",
+        DatabaseMetricsView.as_view(),
+        name="metrics-db",
+    ),
 ]
+
+if settings.DEBUG:
+    urlpatterns.append(path("__debug__/", include("debug_toolbar.urls")))
@@ -0,0 +1,85 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+from rest_framework import permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class DatabaseMetricsView(APIView):
+    """
+    Connection acquisition metrics and pool statistics of the worker
+    process that serves the request.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        # Imports psycopg, which SQLite deployments never load otherwise
+        from core.db.backends.postgresql.base import get_metrics
+
+        return Response(get_metrics(connections))
+
+
+# Seconds in a year, the lifetime of a versioned schema
+SCHEMA_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@lru_cache(maxsize=None)
+def get_schema_view(renderer):
+    """
+    Builds the drf_yasg UI view of renderer on its first request. The UI
+    loads the schema from schema_artifact_view, drf_yasg stays out of
+    the imports of the URLconf.
+    """
+    from drf_yasg.views import get_schema_view
+
+    from core.schema import UI_RENDERERS, get_info
+
+    schema_view = get_schema_view(
+        get_info(),
+        public=True,
+        permission_classes=(permissions.AllowAny,),
+    )
+    return schema_view.as_view(renderer_classes=[UI_RENDERERS[renderer]])
+
+
+def lazy_schema_view(renderer):
+    def view(request, *args, **kwargs):
+        return get_schema_view(renderer)(request, *args, **kwargs)
+
+    return view
+
+
+@require_safe
+def schema_artifact_view(request, format):
+    """
+    Serves the schema written by generate_schema, with an ETag. Asked
+    for by its version, as the UIs do, it is cached for a year.
+    """
+    from core.schema import FORMATS, get_artifact
+
+    format = format.lstrip(".")
+    if format not in FORMATS:
+        raise Http404()
+    artifact = get_artifact(format)
+    etag = f'"{artifact.version}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(
+            artifact.content, content_type=artifact.content_type
+        )
+    response["ETag"] = etag
+    if request.GET.get("v") == artifact.version:
+        patch_cache_control(
+            response, public=True, max_age=SCHEMA_MAX_AGE, immutable=True
+        )
+    else:
+        patch_cache_control(
+            response, public=True, max_age=settings.API_SCHEMA_CACHE_TIMEOUT
+        )
+    return response